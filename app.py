@@ -2,107 +2,147 @@ import streamlit as st
 import pandas as pd
 import os
 import datetime
+import io
+import tempfile
 import time
+from functools import partial
+
+import profiling
+from store import StaleVersionError, JournalMismatchError
+from strategies import FILE_OVERS, FILE_STATS, FILE_SECURE, FILE_GOLD, FILE_CIA_2E, FILE_MOY_GLIS_2E, STRATEGIES, RECAP_STRATEGIES, OVERS, LISTING_COLUMNS
+from data import save_from_editor, add_new_bet, import_bets, export_bets, date_index, monthly_rollups, bankroll_index
 
 # --- CONFIGURATION ---
 st.set_page_config(page_title="Gestion Bankroll Multi", page_icon="💰", layout="wide")
 
 # --- FICHIERS DE SAUVEGARDE ---
-FILE_OVERS = "paris_overs.csv" 
-FILE_STATS = "stats_max.csv"
-FILE_SECURE = "home_draw.csv"
-FILE_GOLD = "prono_or.csv"
-FILE_CIA_2E = "cia_2echec.csv"
-FILE_MOY_GLIS_2E = "moy_glissante_2e.csv" # Nouveau fichier
+# FILE_* et registre des stratégies : définis dans strategies.py (partagés avec le rapport en ligne de commande)
 
 # ==============================================================================
-# FONCTIONS PARTAGÉES & OPTIMISÉES
+# TABLEAUX PAGINÉS (communs aux pages stratégie)
 # ==============================================================================
+# Seule la page visible est construite puis envoyée à l'éditeur ; les modifications
+# sont rattachées aux lignes par Original_Idx (cf. save_from_editor).
+ROWS_PER_PAGE = 50
+STALE_WARNING = "⚠️ Ce tableau a été modifié ailleurs entre-temps : ta modification n'a pas été enregistrée, les données ont été rechargées."
+
+def table_pager(key, total):
+    # Tranche de l'ordre d'affichage correspondant à la page choisie
+    n_pages = max(1, -(-total // ROWS_PER_PAGE))
+    if n_pages == 1: return slice(0, total)
+    if st.session_state.get(key, 1) > n_pages: st.session_state[key] = n_pages  # filtres resserrés
+    c_page, c_info = st.columns([1, 3])
+    page_num = c_page.number_input("Page", min_value=1, max_value=n_pages, step=1, key=key)
+    start = (page_num - 1) * ROWS_PER_PAGE
+    end = min(start + ROWS_PER_PAGE, total)
+    c_info.caption(f"Page {page_num} / {n_pages} — paris {start + 1} à {end} sur {total}")
+    return slice(start, end)
+
+@profiling.timed
+def edit_table(df_display, file_path, cols_to_save, col_config):
+    # L'éditeur est lié à la version et aux lignes affichées : ses modifications (par position)
+    # ne peuvent pas être rejouées sur d'autres données. Si la stratégie change ailleurs entre
+    # l'affichage et la modification, celle-ci est refusée au lieu d'écraser l'autre écriture.
+    state = st.session_state.setdefault(f"table_{file_path}", {})
+    version = df_display.attrs.get("version")
+    key = f"editor_{file_path}_{hash((str(version), tuple(df_display['Original_Idx']))) & 0xFFFFFFFF:x}"
+    prev = state.get("key")
+    if prev and prev != key and state.get("version") != version and not state.pop("own_write", False):
+        pending = st.session_state.get(prev)
+        if pending and pending.get("edited_rows"): st.warning(STALE_WARNING)
+    state.update(key=key, version=version)
+
+    df_show = df_display.copy()
+    df_show["Date"] = df_show["Date"].dt.date
+    # Colonnes catégorielles (cf. data._clean) : texte libre dans l'éditeur
+    for col in df_show.select_dtypes("category").columns: df_show[col] = df_show[col].astype(object)
+    h_calc = min((len(df_show) + 1) * 38 + 10, 1200)
+    with profiling.stage("st.data_editor"):
+        edited = st.data_editor(df_show, height=h_calc, width="stretch", num_rows="fixed", hide_index=True, column_config=col_config, key=key)
+    try:
+        if save_from_editor(edited, file_path, cols_to_save, df_display, version):
+            state["own_write"] = True
+            st.rerun()
+    except StaleVersionError:
+        st.warning(STALE_WARNING)
 
-@st.cache_data(show_spinner=False) 
-def clean_and_read_csv(file_path):
-    if os.path.exists(file_path):
-        try:
-            df = pd.read_csv(file_path)
-            
-            # Nettoyage colonnes parasites (on supprime aussi Date.1 si elle s'est créée par erreur)
-            cols_to_drop = ["ID_Tech", "Original_Idx", "Unnamed: 0", "Date.1"]
-            for bad_col in cols_to_drop:
-                if bad_col in df.columns: df = df.drop(columns=[bad_col])
+# ==============================================================================
+# ANALYSE GLISSANTE (commune aux pages stratégie)
+# ==============================================================================
+CHART_MAX_POINTS = 1000
+
+@profiling.timed
+def rolling_panel(file_path):
+    # Sur tout l'historique de la stratégie, recalculée seulement quand elle change (cf. bankroll_index)
+    with st.expander("📈 Analyse glissante", expanded=False):
+        c1, c2 = st.columns(2)
+        n_bets = int(c1.number_input("Fenêtre (nb de paris)", 2, 1000, 20, key=f"roll_n_{file_path}"))
+        n_days = int(c2.number_input("Fenêtre (jours)", 1, 365, 30, key=f"roll_d_{file_path}"))
+        out, s = bankroll_index.rolling(file_path, n_bets, n_days)
+        if not s or pd.isna(s["roi_n"]):
+            st.info("Pas encore de pari réglé.")
+            return
+
+        k1, k2, k3, k4 = st.columns(4)
+        k1.metric(f"ROI {n_bets} derniers paris", f"{s['roi_n']:+.1f} %")
+        k2.metric(f"Réussite {n_bets} derniers", f"{s['win_rate_n']:.1f} %")
+        k3.metric(f"Cote moy. {n_bets} derniers", f"{s['avg_odds_n']:.2f}")
+        k4.metric(f"ROI {n_days} derniers jours", f"{s['roi_days']:+.1f} %")
+        k5, k6, k7, k8 = st.columns(4)
+        k5.metric("Drawdown actuel", f"{-s['drawdown']:+.2f} u")
+        k6.metric("Drawdown max", f"{-s['max_drawdown']:+.2f} u")
+        k7.metric("Série de pertes en cours", s["losing_streak"])
+        k8.metric("Plus longue série de pertes", s["max_losing_streak"])
+        if s["alert"]: st.warning(f"⚠️ Signal 2 échecs : {s['losing_streak']} pertes consécutives en cours.")
+
+        chart = out.set_index("Date")[["ROI_N", "ROI_Jours"]].rename(columns={"ROI_N": f"ROI {n_bets} paris (%)", "ROI_Jours": f"ROI {n_days} jours (%)"})
+        st.line_chart(chart.iloc[::max(1, len(chart) // CHART_MAX_POINTS)])
+
+
+# ==============================================================================
+# IMPORT / EXPORT EN MASSE (commun aux pages stratégie)
+# ==============================================================================
+# Import avant la lecture des données de la page : le tableau affiché dans la foulée contient déjà les
+# paris importés. Export généré au clic, écrit par tranches dans un fichier temporaire (sur disque au-delà de 8 Mo).
+EXPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+def import_panel(title, file_path, columns):
+    with st.expander(f"📥 Importer des paris {title} (CSV ou liste collée)", expanded=False):
+        st.caption(f"Colonnes : {', '.join(columns)} — séparateur , ; ou tabulation, en-tête facultatif. "
+                   "Les paris déjà présents (même Date, Équipe et Cote) sont ignorés.")
+        uploaded = st.file_uploader("Fichier CSV", type=["csv", "txt"], key=f"import_file_{file_path}")
+        pasted = st.text_area("… ou colle une liste (une ligne par pari)", key=f"import_text_{file_path}", height=150)
+        if st.button("Importer", key=f"import_btn_{file_path}"):
+            if uploaded is None and not pasted.strip():
+                st.warning("Rien à importer.")
+                return
+            try: report = import_bets(file_path, uploaded if uploaded is not None else io.StringIO(pasted), columns)
+            except ValueError as e:
+                st.error(f"Import annulé : {e}")
+                return
+            st.success(f"{report['added']} paris ajoutés sur {report['read']} lignes "
+                       f"({report['duplicates']} doublons ignorés, {report['invalid']} lignes invalides).")
+
+def _export_file(file_path, columns, start, end, sub_types):
+    spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    text = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+    export_bets(file_path, text, start, end, sub_types, columns)
+    text.flush()
+    text.detach()
+    spool.seek(0)
+    return spool
+
+def export_button(file_path, columns, start, end, sub_types=None):
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    st.download_button("📤 Exporter la vue filtrée (CSV)", partial(_export_file, file_path, columns, start, end, sub_types),
+                       file_name=f"{name}_{start:%Y%m%d}_{end:%Y%m%d}.csv", mime="text/csv", on_click="ignore",
+                       key=f"export_{file_path}")
 
-        except:
-            return pd.DataFrame()
-        
-        if "Date" in df.columns:
-            df["Date"] = df["Date"].astype(str).str.split(" ").str[0]
-            df["Date"] = pd.to_datetime(df["Date"], dayfirst=True, format='mixed', errors='coerce')
-            df["Date"] = df["Date"].fillna(pd.Timestamp.today())
-            df["Date"] = df["Date"].dt.normalize()
-            
-        if "Cote" in df.columns:
-            df["Cote"] = pd.to_numeric(df["Cote"], errors='coerce').fillna(0.0)
-            
-        return df
-    return pd.DataFrame()
-
-def calculate_gain_unit(df):
-    if df.empty: return df
-    def get_gain(row):
-        statut = str(row.get("Resultat", "En attente"))
-        try: cote = float(row.get("Cote", 0.0))
-        except: cote = 0.0
-        if statut == "Gagné": return cote - 1
-        elif statut == "Perdu": return -1.0
-        else: return 0.0
-    df["Gain_Unit"] = df.apply(get_gain, axis=1)
-    return df
-
-def calculate_bankroll(df):
-    if df.empty: return df
-    df = calculate_gain_unit(df)
-    df["Original_Idx"] = df.index
-    df_calc = df.sort_values(by=["Date", "Original_Idx"], ascending=[True, False])
-    df_calc["Total_Bankroll"] = df_calc["Gain_Unit"].cumsum()
-    df_display = df_calc.sort_values(by=["Date", "Original_Idx"], ascending=[False, True])
-    return df_display
-
-def save_from_editor(edited_df, file_path, cols_to_save):
-    if os.path.exists(file_path):
-        try: df_full = pd.read_csv(file_path)
-        except: return 
-    else: return
-
-    if "Date" in df_full.columns:
-        df_full["Date"] = pd.to_datetime(df_full["Date"], dayfirst=True, format='mixed', errors='coerce')
-
-    for index, row in edited_df.iterrows():
-        original_idx = row["Original_Idx"]
-        if original_idx in df_full.index:
-            for col in cols_to_save:
-                if col in row and col != "Date":
-                    df_full.at[original_idx, col] = row[col]
-            if "Date" in row:
-                df_full.at[original_idx, "Date"] = pd.to_datetime(row["Date"])
-
-    df_save = df_full.sort_values(by=["Date"], ascending=[False], kind='stable')
-    df_save["Date"] = pd.to_datetime(df_save["Date"]).dt.strftime('%Y-%m-%d')
-    df_save = df_save[cols_to_save]
-    df_save.to_csv(file_path, index=False)
-    st.cache_data.clear()
-
-def add_new_bet(file_path, new_data):
-    new_row = pd.DataFrame([new_data])
-    if os.path.exists(file_path):
-        try: df_old = pd.read_csv(file_path)
-        except: df_old = pd.DataFrame()
-    else: df_old = pd.DataFrame()
-    df_final = pd.concat([new_row, df_old], ignore_index=True)
-    df_final.to_csv(file_path, index=False)
-    st.cache_data.clear()
 
 # ==============================================================================
 # 1. PAGE OVERS
 # ==============================================================================
+@profiling.timed
 def page_overs(title, file_path):
     st.header(title)
     
@@ -126,17 +166,9 @@ def page_overs(title, file_path):
                 st.success("Ajouté !")
                 st.rerun()
 
-    st.divider()
-    
-    df = clean_and_read_csv(file_path)
     required_cols = ["Date", "Equipe", "Type_Over", "Cote", "Resultat"]
-    
-    for c in required_cols: 
-        if c not in df.columns: df[c] = ""
-
-    # Correction automatique si le + a sauté dans le CSV
-    if not df.empty:
-        df["Type_Over"] = df["Type_Over"].astype(str).replace({"1.5": "+1.5", "2.5": "+2.5", "nan": ""})
+    import_panel(title, file_path, required_cols)
+    st.divider()
 
     # Filtres
     c_filter, c_start, c_end = st.columns([2, 1, 1])
@@ -145,33 +177,23 @@ def page_overs(title, file_path):
     d_start = c_start.date_input("Du", value=datetime.date(2023, 1, 1))
     d_end = c_end.date_input("Au", value=datetime.date.today() + datetime.timedelta(days=365))
 
-    if not df.empty:
-        mask = (df["Date"] >= pd.to_datetime(d_start)) & (df["Date"] <= pd.to_datetime(d_end))
-        
-        if filter_type:
-            mask = mask & (df["Type_Over"].isin(filter_type))
-            
-        df_filtered = df[mask].copy()
-        df_display = calculate_bankroll(df_filtered)
-        
-        if not df_display.empty:
-            roi = df_display["Total_Bankroll"].iloc[0]
-            nb = len(df_display)
-            avg_odds = df_display["Cote"].mean()
-            if nb > 0: win_rate = (len(df_display[df_display["Resultat"] == "Gagné"]) / nb * 100)
-            else: win_rate = 0
+    if bankroll_index.count(file_path):
+        # Plage de dates + type : KPIs de l'index cumulé (pas de tri ni de cumsum sur tout l'historique)
+        with profiling.stage("kpis"): kpi = bankroll_index.kpis(file_path, d_start, d_end, filter_type)
 
+        if kpi["nb"]:
             k1, k2, k3, k4 = st.columns(4)
-            k1.metric("Bénéfice (Filtré)", f"{roi:+.2f} u")
-            k2.metric("Nb Paris", nb)
-            k3.metric("Cote Moy.", f"{avg_odds:.2f}")
-            k4.metric("Réussite", f"{win_rate:.1f} %")
-            
-            df_show = df_display.copy()
-            df_show["Date"] = df_show["Date"].dt.date
-            
-            h_calc = (len(df_show) + 1) * 38 + 10
-            if h_calc > 1200: h_calc = 1200
+            k1.metric("Bénéfice (Filtré)", f"{kpi['gain']:+.2f} u")
+            k2.metric("Nb Paris", kpi["nb"])
+            k3.metric("Cote Moy.", f"{kpi['avg_odds']:.2f}")
+            k4.metric("Réussite", f"{kpi['win_rate']:.1f} %")
+            rolling_panel(file_path)
+            export_button(file_path, required_cols, d_start, d_end, filter_type)
+
+            rows = table_pager(f"page_{file_path}", kpi["nb"])
+            with profiling.stage("fenêtre"): df_display = bankroll_index.window(file_path, d_start, d_end, filter_type, required_cols, rows)
+            # Correction automatique si le + a sauté dans le CSV
+            df_display["Type_Over"] = df_display["Type_Over"].astype(str).replace({"1.5": "+1.5", "2.5": "+2.5", "nan": ""})
             
             col_config = {
                 "Date": st.column_config.DateColumn("Date", format="DD/MM/YYYY"),
@@ -184,18 +206,7 @@ def page_overs(title, file_path):
                 "Original_Idx": None
             }
 
-            edited = st.data_editor(
-                df_show, 
-                height=h_calc, 
-                width="stretch", 
-                num_rows="fixed", 
-                hide_index=True,
-                column_config=col_config
-            )
-            
-            if not edited[required_cols].equals(df_display[required_cols]):
-                save_from_editor(edited, file_path, required_cols)
-                st.rerun()
+            edit_table(df_display, file_path, required_cols, col_config)
         else:
             st.warning("Aucun résultat avec ces filtres.")
     else:
@@ -205,6 +216,7 @@ def page_overs(title, file_path):
 # ==============================================================================
 # 2. PAGE GÉNÉRIQUE (Stats Max, 1N, Prono Or)
 # ==============================================================================
+@profiling.timed
 def generic_page(title, file_path, extra_col, placeholder):
     st.header(title)
     with st.expander(f"➕ Ajouter un pari {title}", expanded=False):
@@ -218,38 +230,30 @@ def generic_page(title, file_path, extra_col, placeholder):
             if st.form_submit_button("Ajouter"):
                 add_new_bet(file_path, {"Date": date_in.strftime('%Y-%m-%d'), "Equipe": team_in, extra_col: extra_val, "Cote": cote_in, "Resultat": res_in})
                 st.success("Ajouté !"); st.rerun()
+    required = ["Date", "Equipe", extra_col, "Cote", "Resultat"]
+    import_panel(title, file_path, required)
     st.divider()
     c_start, c_end = st.columns(2)
     d_start = c_start.date_input("Du", value=datetime.date(2023, 1, 1))
     d_end = c_end.date_input("Au", value=datetime.date.today() + datetime.timedelta(days=365))
-    
-    df = clean_and_read_csv(file_path)
-    required = ["Date", "Equipe", extra_col, "Cote", "Resultat"]
-    for c in required: 
-        if c not in df.columns: df[c] = ""
         
-    if not df.empty:
-        df[extra_col] = df[extra_col].astype(str).replace("nan", "") 
-
-        mask = (df["Date"] >= pd.to_datetime(d_start)) & (df["Date"] <= pd.to_datetime(d_end))
-        df_filtered = df[mask].copy()
-        df_display = calculate_bankroll(df_filtered)
-        if not df_display.empty:
-            roi = df_display["Total_Bankroll"].iloc[0]
+    if bankroll_index.count(file_path):
+        with profiling.stage("kpis"): kpi = bankroll_index.kpis(file_path, d_start, d_end)
+        if kpi["nb"]:
             k1, k2, k3, k4 = st.columns(4)
-            k1.metric("Bénéfice", f"{roi:+.2f} u")
-            k2.metric("Nb", len(df_display))
-            k3.metric("Cote Moy", f"{df_display['Cote'].mean():.2f}")
-            if len(df_display) > 0: win_rate = (len(df_display[df_display['Resultat']=='Gagné'])/len(df_display)*100)
-            else: win_rate = 0
-            k4.metric("Win %", f"{win_rate:.1f}%")
+            k1.metric("Bénéfice", f"{kpi['gain']:+.2f} u")
+            k2.metric("Nb", kpi["nb"])
+            k3.metric("Cote Moy", f"{kpi['avg_odds']:.2f}")
+            k4.metric("Win %", f"{kpi['win_rate']:.1f}%")
+            rolling_panel(file_path)
+            export_button(file_path, required, d_start, d_end)
             
-            df_show = df_display.copy(); df_show["Date"] = df_show["Date"].dt.date
+            rows = table_pager(f"page_{file_path}", kpi["nb"])
+            with profiling.stage("fenêtre"): df_display = bankroll_index.window(file_path, d_start, d_end, required=required, rows=rows)
+            df_display[extra_col] = df_display[extra_col].astype(str).replace("nan", "")
             col_conf = {"Date": st.column_config.DateColumn("Date", format="DD/MM/YYYY"), "Cote": st.column_config.NumberColumn("Cote", format="%.2f"), "Gain_Unit": st.column_config.NumberColumn("Gain", format="%+.2f u", disabled=True), "Total_Bankroll": st.column_config.NumberColumn("Cumul", format="%+.2f u", disabled=True), "Original_Idx": None}
             col_conf[extra_col] = st.column_config.TextColumn(extra_col, width="medium")
-            
-            edited = st.data_editor(df_show, height=(len(df_show)+1)*38+10, width="stretch", num_rows="fixed", hide_index=True, column_config=col_conf)
-            if not edited[required].equals(df_display[required]): save_from_editor(edited, file_path, required); st.rerun()
+            edit_table(df_display, file_path, required, col_conf)
         else: st.warning("Aucune donnée.")
     else: st.info(f"Ajoute ton premier pari {title} !")
 
@@ -257,6 +261,7 @@ def generic_page(title, file_path, extra_col, placeholder):
 # ==============================================================================
 # 3. PAGE SIMPLE (CIA 2echec & MoyGlissante)
 # ==============================================================================
+@profiling.timed
 def page_simple(title, file_path):
     st.header(title)
     with st.expander(f"➕ Ajouter un pari {title}", expanded=False):
@@ -270,35 +275,28 @@ def page_simple(title, file_path):
             if st.form_submit_button("Ajouter"):
                 add_new_bet(file_path, {"Date": date_in.strftime('%Y-%m-%d'), "Equipe": team_in, "Cote": cote_in, "Resultat": res_in})
                 st.success("Ajouté !"); st.rerun()
+    required = ["Date", "Equipe", "Cote", "Resultat"]
+    import_panel(title, file_path, required)
     st.divider()
     c_start, c_end = st.columns(2)
     d_start = c_start.date_input("Du", value=datetime.date(2023, 1, 1))
     d_end = c_end.date_input("Au", value=datetime.date.today() + datetime.timedelta(days=365))
-    
-    df = clean_and_read_csv(file_path)
-    required = ["Date", "Equipe", "Cote", "Resultat"]
-    for c in required: 
-        if c not in df.columns: df[c] = ""
         
-    if not df.empty:
-        mask = (df["Date"] >= pd.to_datetime(d_start)) & (df["Date"] <= pd.to_datetime(d_end))
-        df_filtered = df[mask].copy()
-        df_display = calculate_bankroll(df_filtered)
-        if not df_display.empty:
-            roi = df_display["Total_Bankroll"].iloc[0]
+    if bankroll_index.count(file_path):
+        with profiling.stage("kpis"): kpi = bankroll_index.kpis(file_path, d_start, d_end)
+        if kpi["nb"]:
             k1, k2, k3, k4 = st.columns(4)
-            k1.metric("Bénéfice", f"{roi:+.2f} u")
-            k2.metric("Nb", len(df_display))
-            k3.metric("Cote Moy", f"{df_display['Cote'].mean():.2f}")
-            if len(df_display) > 0: win_rate = (len(df_display[df_display['Resultat']=='Gagné'])/len(df_display)*100)
-            else: win_rate = 0
-            k4.metric("Win %", f"{win_rate:.1f}%")
+            k1.metric("Bénéfice", f"{kpi['gain']:+.2f} u")
+            k2.metric("Nb", kpi["nb"])
+            k3.metric("Cote Moy", f"{kpi['avg_odds']:.2f}")
+            k4.metric("Win %", f"{kpi['win_rate']:.1f}%")
+            rolling_panel(file_path)
+            export_button(file_path, required, d_start, d_end)
             
-            df_show = df_display.copy(); df_show["Date"] = df_show["Date"].dt.date
+            rows = table_pager(f"page_{file_path}", kpi["nb"])
+            with profiling.stage("fenêtre"): df_display = bankroll_index.window(file_path, d_start, d_end, required=required, rows=rows)
             col_conf = {"Date": st.column_config.DateColumn("Date", format="DD/MM/YYYY"), "Cote": st.column_config.NumberColumn("Cote", format="%.2f"), "Gain_Unit": st.column_config.NumberColumn("Gain", format="%+.2f u", disabled=True), "Total_Bankroll": st.column_config.NumberColumn("Cumul", format="%+.2f u", disabled=True), "Original_Idx": None}
-            
-            edited = st.data_editor(df_show, height=(len(df_show)+1)*38+10, width="stretch", num_rows="fixed", hide_index=True, column_config=col_conf)
-            if not edited[required].equals(df_display[required]): save_from_editor(edited, file_path, required); st.rerun()
+            edit_table(df_display, file_path, required, col_conf)
         else: st.warning("Aucune donnée.")
     else: st.info(f"Ajoute ton premier pari {title} !")
 
@@ -306,6 +304,7 @@ def page_simple(title, file_path):
 # ==============================================================================
 # 4. PAGE PARIS PAR DATE
 # ==============================================================================
+@profiling.timed
 def page_matchs_par_date():
     st.header("📅 Paris par Date")
     
@@ -314,44 +313,39 @@ def page_matchs_par_date():
     st.markdown(f"#### Vos paris pour le : **{selected_date.strftime('%d/%m/%Y')}**")
     st.divider()
 
-    strategies = {
-        "⚽ Paris Overs": FILE_OVERS, 
-        "📊 Stats Max": FILE_STATS, 
-        "🛡️ 1N & Plus": FILE_SECURE, 
-        "🧠 CIA 2echec": FILE_CIA_2E,
-        "📈 MoyGlissante 2Echecs": FILE_MOY_GLIS_2E,
-        "🏆 Prono en Or": FILE_GOLD
-    }
-
-    all_selected_bets = []
-
-    for name, filepath in strategies.items():
-        df = clean_and_read_csv(filepath)
-        if not df.empty:
-            df_selected = df[df["Date"].dt.date == selected_date].copy()
-            if not df_selected.empty:
-                df_selected.insert(0, "Stratégie", name)
-                all_selected_bets.append(df_selected)
-
-    if all_selected_bets:
-        final_df = pd.concat(all_selected_bets, ignore_index=True)
+    strategies = STRATEGIES
+
+    # Lecture dans l'index date -> paris (pas de parcours des historiques complets)
+    with profiling.stage("index date"): final_df = date_index.on(strategies, selected_date)
+
+    cols_order = LISTING_COLUMNS
+
+    if not final_df.empty:
         final_df["Date"] = final_df["Date"].dt.date
-        
-        cols_order = ["Stratégie", "Equipe", "Cote", "Resultat"]
-        if "Type_Over" in final_df.columns: cols_order.append("Type_Over")
-        if "Type_Pari" in final_df.columns: cols_order.append("Type_Pari")
-        if "Infos" in final_df.columns: cols_order.append("Infos")
-        
         cols_to_show = [c for c in cols_order if c in final_df.columns]
         
-        st.dataframe(final_df[cols_to_show], use_container_width=True, hide_index=True)
+        with profiling.stage("st.dataframe"): st.dataframe(final_df[cols_to_show], use_container_width=True, hide_index=True)
         st.success(f"Vous avez **{len(final_df)} paris** enregistrés pour le {selected_date.strftime('%d/%m/%Y')}.")
     else:
         st.info(f"Aucun pari n'est enregistré pour le {selected_date.strftime('%d/%m/%Y')}.")
 
+    st.divider()
+    st.markdown("#### ⏳ Paris en attente à venir")
+    nb_days = st.number_input("Nombre de jours (à partir d'aujourd'hui) :", 1, 90, 7)
+    with profiling.stage("index date"): pending_df = date_index.pending(strategies, nb_days)
+    if not pending_df.empty:
+        pending_df["Date"] = pending_df["Date"].dt.date
+        cols_to_show = ["Date"] + [c for c in cols_order if c in pending_df.columns]
+        with profiling.stage("st.dataframe"):
+            st.dataframe(pending_df[cols_to_show], width="stretch", hide_index=True,
+                         column_config={"Date": st.column_config.DateColumn("Date", format="DD/MM/YYYY")})
+    else:
+        st.info(f"Aucun pari en attente sur les {nb_days} prochains jours.")
+
 # ==============================================================================
 # RECAPITULATIF GLOBAL
 # ==============================================================================
+@profiling.timed
 def page_recap():
     st.header("🏆 Récapitulatif Mensuel Global")
     
@@ -363,53 +357,40 @@ def page_recap():
 
     st.divider()
 
-    strategies = {
-        "⚽ Paris Overs": FILE_OVERS, 
-        "📊 Stats Max": FILE_STATS, 
-        "🧠 CIA 2echec": FILE_CIA_2E,
-        "📈 MoyGlissante 2Echecs": FILE_MOY_GLIS_2E,
-        "🏆 Prono en Or": FILE_GOLD
-    }
-    
-    all_data = []
+    strategies = RECAP_STRATEGIES
     
-    for name, filepath in strategies.items():
-        df = clean_and_read_csv(filepath)
-        if not df.empty:
-            
-            # --- APPLICATION DES FILTRES DE SIMULATION ---
-            if name == "⚽ Paris Overs":
-                if recap_over_choice and "Type_Over" in df.columns:
-                    # Sécurité pour bien comparer
-                    df["Type_Over"] = df["Type_Over"].astype(str).replace({"1.5": "+1.5", "2.5": "+2.5"})
-                    df = df[df["Type_Over"].isin(recap_over_choice)]
-
-            if df.empty: continue
-
-            df = calculate_gain_unit(df)
-            df['Month_Sort'] = df['Date'].dt.to_period('M')
-            months_fr = {1:'Janvier', 2:'Février', 3:'Mars', 4:'Avril', 5:'Mai', 6:'Juin', 7:'Juillet', 8:'Août', 9:'Septembre', 10:'Octobre', 11:'Novembre', 12:'Décembre'}
-            df['Mois'] = df['Date'].apply(lambda x: f"{months_fr[x.month]} {x.year}")
-            monthly_gains = df.groupby(['Month_Sort', 'Mois'])['Gain_Unit'].sum().reset_index()
-            monthly_gains['Stratégie'] = name
-            all_data.append(monthly_gains)
-    
-    if all_data:
-        full_df = pd.concat(all_data)
-        pivot = full_df.pivot_table(index=['Month_Sort', 'Mois'], columns='Stratégie', values='Gain_Unit', aggfunc='sum').fillna(0)
-        pivot = pivot.sort_index(ascending=True)
-        pivot.index = pivot.index.get_level_values('Mois')
-        pivot["TOTAL MOIS"] = pivot.sum(axis=1)
-        pivot = pd.concat([pivot, pd.DataFrame(pivot.sum(axis=0).rename("TOTAL GÉNÉRAL")).T])
-        
+    # Agrégats mensuels matérialisés : plus de relecture / recalcul complet à chaque filtre
+    with profiling.stage("récap"): pivot = monthly_rollups.recap(strategies, {OVERS: recap_over_choice})
+
+    if pivot is not None:
         def color_coding(val): return f'color: {"red" if val < 0 else "green" if val > 0 else "black"}; font-weight: bold'
-        st.dataframe(pivot.style.map(color_coding).format("{:+.2f} u"), width="stretch", height=(len(pivot)+1)*35+50)
+        with profiling.stage("st.dataframe"): st.dataframe(pivot.style.map(color_coding).format("{:+.2f} u"), width="stretch", height=(len(pivot)+1)*35+50)
         
         total_global = pivot.loc['TOTAL GÉNÉRAL', 'TOTAL MOIS']
         st.metric("Bénéfice Total Cumulé (Après filtres)", f"{total_global:+.2f} u")
         
     else: st.warning("Pas de données correspondant aux critères.")
 
+# ==============================================================================
+# PROFILAGE (panneau de debug, cf. profiling.py)
+# ==============================================================================
+# Désactivé par défaut (BANKROLL_PROFILE=1 pour l'activer d'office) : sans exécution ouverte,
+# les étapes instrumentées ne coûtent qu'un test.
+def profiling_panel(record, history):
+    with st.sidebar.expander("🔧 Profilage du dernier rerun", expanded=True):
+        if record is None:
+            st.caption("Rien de mesuré pour l'instant.")
+            return
+        c = record["counters"]
+        st.metric(record["page"], f"{record['total_ms']:.0f} ms")
+        st.caption(f"Lectures : {c.get('reads', 0)} fichier(s), {c.get('bytes_read', 0) / 1024:,.0f} Ko, {c.get('rows_read', 0)} lignes — "
+                   f"cache : {c.get('cache_hits', 0)} hit(s) / {c.get('cache_misses', 0)} miss")
+        stages = pd.DataFrame([{"Étape": k, "ms": v["ms"], "Appels": v["n"]} for k, v in record["stages"].items()])
+        if not stages.empty:
+            st.dataframe(stages, hide_index=True, width="stretch", column_config={"ms": st.column_config.NumberColumn("ms", format="%.1f")})
+        st.download_button(f"📤 Exporter les {len(history)} derniers reruns (JSON lines)", profiling.to_jsonl(history),
+                           file_name="profilage.jsonl", mime="application/jsonl", on_click="ignore", key="profiling_export")
+
 # ==============================================================================
 # NAVIGATION
 # ==============================================================================
@@ -426,20 +407,30 @@ with st.sidebar:
         "🏆 Récapitulatif Global"
     ])
     st.divider()
-
-if page == "📅 Paris par Date":
-    page_matchs_par_date()
-elif page == "⚽ Paris Overs":
-    page_overs("⚽ Paris Overs", FILE_OVERS) 
-elif page == "📊 Stats Max":
-    generic_page("📊 Stats Max", FILE_STATS, "Type_Pari", "Over 2.5...") 
-elif page == "🛡️ 1N & Plus":
-    generic_page("🛡️ 1N & Plus", FILE_SECURE, "Infos", "+1.5 buts...")
-elif page == "🧠 CIA 2echec":
-    page_simple("🧠 CIA 2echec", FILE_CIA_2E)
-elif page == "📈 MoyGlissante 2Echecs":
-    page_simple("📈 MoyGlissante 2Echecs", FILE_MOY_GLIS_2E)
-elif page == "🏆 Prono en Or":
-    generic_page("🏆 Prono en Or", FILE_GOLD, "Infos", "Analyse...")
-else:
-    page_recap()
\ No newline at end of file
+    profile_on = st.toggle("🔧 Profilage (debug)", value=profiling.ENABLED, key="profiling")
+
+run = profiling.begin(page) if profile_on else None
+try:
+    if page == "📅 Paris par Date":
+        page_matchs_par_date()
+    elif page == "⚽ Paris Overs":
+        page_overs("⚽ Paris Overs", FILE_OVERS) 
+    elif page == "📊 Stats Max":
+        generic_page("📊 Stats Max", FILE_STATS, "Type_Pari", "Over 2.5...") 
+    elif page == "🛡️ 1N & Plus":
+        generic_page("🛡️ 1N & Plus", FILE_SECURE, "Infos", "+1.5 buts...")
+    elif page == "🧠 CIA 2echec":
+        page_simple("🧠 CIA 2echec", FILE_CIA_2E)
+    elif page == "📈 MoyGlissante 2Echecs":
+        page_simple("📈 MoyGlissante 2Echecs", FILE_MOY_GLIS_2E)
+    elif page == "🏆 Prono en Or":
+        generic_page("🏆 Prono en Or", FILE_GOLD, "Infos", "Analyse...")
+    else:
+        page_recap()
+except JournalMismatchError as e:
+    st.error(f"⚠️ Journal d'écritures non appliqué : {e}. Vérifiez le fichier (copie, restauration...) puis ressaisissez ces paris.")
+finally:
+    # Historique propre à la session : l'export ne mélange pas les reruns des autres utilisateurs
+    history = st.session_state.setdefault("profiling_history", profiling.new_history())
+    record = profiling.end(run, history)
+if profile_on: profiling_panel(record, history)
@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# MOTEUR DE GAINS (colonnaire, sans Streamlit)
+# ==============================================================================
+
+def odds_vector(cote):
+    if not isinstance(cote, pd.Series): cote = pd.Series(cote)
+    if cote.dtype == "float32":
+        # Cote chargée en float32 (7 chiffres significatifs) : on retrouve la valeur saisie (≤ 4 décimales)
+        return np.round(cote.to_numpy(dtype="float64"), 4)
+    if pd.api.types.is_numeric_dtype(cote): return cote.to_numpy(dtype="float64")
+    # Colonne texte / mixte : float() + except de l'ancienne version (illisible ou None -> 0.0, NaN -> NaN),
+    # appliqué une fois par valeur distincte
+    values = cote.to_numpy(dtype=object)
+    codes, uniques = pd.factorize(values)
+    odds = np.append(np.array([_float_or_zero(v) for v in uniques], dtype="float64"), np.nan)[codes]
+    # Cases vides (code -1) une par une : factorize confond NaN, None et pd.NA
+    missing = np.flatnonzero(codes == -1)
+    odds[missing] = [_float_or_zero(v) for v in values[missing]]
+    return odds
+
+def _float_or_zero(value):
+    try: return float(value)
+    except (TypeError, ValueError, OverflowError): return 0.0
+
+def gain_vector(resultat, cote):
+    # Gagné -> cote - 1 / Perdu -> -1 / tout le reste (En attente, Remboursé, inconnu) -> 0
+    if not isinstance(resultat, pd.Series): resultat = pd.Series(resultat)
+    won = (resultat == "Gagné").to_numpy(dtype=bool)
+    lost = (resultat == "Perdu").to_numpy(dtype=bool)
+    return np.select([won, lost], [odds_vector(cote) - 1, -1.0], default=0.0)
+
+def calculate_gain_unit(df):
+    if df.empty: return df
+    resultat = df["Resultat"] if "Resultat" in df.columns else pd.Series("En attente", index=df.index)
+    cote = df["Cote"] if "Cote" in df.columns else pd.Series(0.0, index=df.index)
+    df["Gain_Unit"] = gain_vector(resultat, cote)
+    return df
+
+def calculate_bankroll(df):
+    if df.empty: return df
+    df = calculate_gain_unit(df)
+    df["Original_Idx"] = df.index
+    df_calc = df.sort_values(by=["Date", "Original_Idx"], ascending=[True, False])
+    df_calc["Total_Bankroll"] = df_calc["Gain_Unit"].cumsum()
+    df_display = df_calc.sort_values(by=["Date", "Original_Idx"], ascending=[False, True])
+    return df_display
+
+
+# ==============================================================================
+# AGRÉGATS MENSUELS (Récapitulatif Global)
+# ==============================================================================
+# Une ligne par (mois, sous-type) : somme des gains, nb de paris, nb gagnés, somme des cotes.
+# Le sous-type est le Type_Over normalisé ("+1.5" / "+2.5") pour les Overs, vide sinon.
+
+MONTHS_FR = {1:'Janvier', 2:'Février', 3:'Mars', 4:'Avril', 5:'Mai', 6:'Juin', 7:'Juillet', 8:'Août', 9:'Septembre', 10:'Octobre', 11:'Novembre', 12:'Décembre'}
+ROLLUP_COLS = ["Gain_Unit", "Nb", "Gagnes", "Cotes"]
+
+def month_label(period):
+    return f"{MONTHS_FR[period.month]} {period.year}"
+
+def sub_type(df):
+    if "Type_Over" not in df.columns: return pd.Series("", index=df.index)
+    col = df["Type_Over"]
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        # Catégories : on normalise les libellés une fois, puis lecture par code (-1 = vide -> "nan")
+        labels = pd.Series(list(col.cat.categories.astype(str)) + ["nan"]).replace({"1.5": "+1.5", "2.5": "+2.5"})
+        return pd.Series(labels.to_numpy(dtype=object)[col.cat.codes.to_numpy()], index=df.index)
+    return col.astype(str).fillna("nan").replace({"1.5": "+1.5", "2.5": "+2.5"})
+
+def rollup_rows(df):
+    # Contribution de chaque pari à l'agrégat mensuel (même index que df)
+    resultat = df["Resultat"] if "Resultat" in df.columns else pd.Series("En attente", index=df.index)
+    cote = df["Cote"] if "Cote" in df.columns else pd.Series(0.0, index=df.index)
+    return pd.DataFrame({
+        "Month_Sort": df["Date"].dt.to_period("M"),
+        "Sous_Type": sub_type(df),
+        "Gain_Unit": gain_vector(resultat, cote),
+        "Nb": 1,
+        "Gagnes": (resultat == "Gagné").to_numpy(dtype=int),
+        "Cotes": odds_vector(cote),
+    }, index=df.index)
+
+def rollup(rows):
+    return rows.groupby(["Month_Sort", "Sous_Type"])[ROLLUP_COLS].sum()
+
+def merge_rollups(table, delta, sign=1):
+    # Mise à jour incrémentale ; arrondi pour ne pas accumuler d'erreurs d'addition/soustraction
+    table = table.add(delta * sign, fill_value=0)
+    table[["Gain_Unit", "Cotes"]] = table[["Gain_Unit", "Cotes"]].round(9)
+    return table[table["Nb"] > 0]
+
+def monthly_gains(table, sub_types=None):
+    # Gains par mois d'une stratégie, éventuellement limités à certains sous-types
+    if sub_types: table = table[table.index.get_level_values("Sous_Type").isin(sub_types)]
+    return table.groupby(level="Month_Sort")["Gain_Unit"].sum()
+
+def recap_pivot(gains_by_strategy):
+    # gains_by_strategy = {stratégie: Series mois -> gains} ; même tableau que l'ancien page_recap
+    parts = []
+    for name, gains in gains_by_strategy.items():
+        if gains.empty: continue
+        part = gains.rename("Gain_Unit").reset_index()
+        part["Mois"] = [month_label(p) for p in part["Month_Sort"]]
+        part["Stratégie"] = name
+        parts.append(part)
+    if not parts: return None
+    full_df = pd.concat(parts)
+    pivot = full_df.pivot_table(index=['Month_Sort', 'Mois'], columns='Stratégie', values='Gain_Unit', aggfunc='sum').fillna(0)
+    pivot = pivot.sort_index(ascending=True)
+    pivot.index = pivot.index.get_level_values('Mois')
+    pivot["TOTAL MOIS"] = pivot.sum(axis=1)
+    pivot = pd.concat([pivot, pd.DataFrame(pivot.sum(axis=0).rename("TOTAL GÉNÉRAL")).T])
+    return pivot
+
+
+# ==============================================================================
+# SOMMES CUMULÉES (KPIs par plage de dates)
+# ==============================================================================
+# Paris triés dans l'ordre de calcul de la bankroll (Date croissante, du plus ancien au plus récent) :
+# les KPIs d'une plage = différence de deux sommes cumulées, bornes trouvées par dichotomie.
+
+PREFIX_COLS = ["Gain_Unit", "Nb", "Gagnes", "Cotes"]
+
+def prefix_sums(resultat, cote, gains=None):
+    if gains is None: gains = gain_vector(resultat, cote)
+    if not isinstance(resultat, pd.Series): resultat = pd.Series(resultat)
+    cols = {"Gain_Unit": gains, "Nb": np.ones(len(gains), dtype=np.int64),
+            "Gagnes": (resultat == "Gagné").to_numpy(dtype=np.int64), "Cotes": odds_vector(cote)}
+    return {k: np.concatenate([[0], np.cumsum(v)]) for k, v in cols.items()}
+
+def window_sums(prefix, lo, hi):
+    return {k: prefix[k][hi] - prefix[k][lo] for k in PREFIX_COLS}
+
+def window_kpis(sums_list):
+    # Bénéfice, Nb, Cote Moy., Réussite (%) à partir d'une ou plusieurs fenêtres (une par Type_Over)
+    total = {k: sum(s[k] for s in sums_list) for k in PREFIX_COLS}
+    nb = int(total["Nb"])
+    return {"gain": round(float(total["Gain_Unit"]), 9), "nb": nb,
+            "avg_odds": total["Cotes"] / nb if nb else 0.0,
+            "win_rate": total["Gagnes"] / nb * 100 if nb else 0.0}
+
+
+# ==============================================================================
+# ANALYSE GLISSANTE (ROI, réussite, cote moy. sur N paris / N jours, drawdown, séries de pertes)
+# ==============================================================================
+# Entrée : la sortie de calculate_bankroll remise dans l'ordre chronologique (df.iloc[::-1]).
+# Fenêtres calculées sur les paris réglés (Gagné / Perdu / Remboursé) ; un pari en attente reprend
+# les valeurs du dernier pari réglé. Tout est vectorisé : sommes cumulées + différences, O(n).
+
+ROLLING_COLS = ["ROI_N", "Reussite_N", "Cote_N", "ROI_Jours", "Reussite_Jours", "Cote_Jours", "Drawdown", "Serie_Pertes"]
+
+def _window_means(cums, lo, hi):
+    # Moyennes sur [lo, hi] (positions incluses) à partir de sommes cumulées précédées d'un 0
+    count = hi - lo + 1
+    return [(c[hi + 1] - c[lo]) / count for c in cums]
+
+def losing_streaks(lost, counted):
+    # Nb de "Perdu" consécutifs à chaque pari ; les paris non comptés (en attente, remboursés) sont neutres
+    lost = (lost & counted).astype(np.int64)
+    c = np.cumsum(lost)
+    reset = np.where(counted & (lost == 0), c, 0)
+    return c - np.maximum.accumulate(reset)
+
+def rolling_analytics(df, n_bets=20, n_days=30):
+    n = len(df)
+    if n == 0: return pd.DataFrame(columns=["Date"] + ROLLING_COLS), {}
+    resultat = df["Resultat"] if "Resultat" in df.columns else pd.Series("En attente", index=df.index)
+    won = (resultat == "Gagné").to_numpy(dtype=bool)
+    lost = (resultat == "Perdu").to_numpy(dtype=bool)
+    settled = won | lost | (resultat == "Remboursé").to_numpy(dtype=bool)
+    gains = df["Gain_Unit"].to_numpy(dtype="float64")
+    odds = odds_vector(df["Cote"] if "Cote" in df.columns else pd.Series(0.0, index=df.index))
+    dates = df["Date"].to_numpy(dtype="datetime64[ns]")
+    out = pd.DataFrame({"Date": df["Date"].to_numpy()}, index=df.index)
+
+    pos = np.flatnonzero(settled)
+    cums = [np.concatenate([[0.0], np.cumsum(v[pos])]) for v in (gains, won.astype(float), odds)]
+    k = np.arange(len(pos))
+    for suffix, lo in (("N", np.maximum(k - n_bets + 1, 0)),
+                       ("Jours", np.searchsorted(dates[pos], dates[pos] - np.timedelta64(n_days - 1, "D"), side="left"))):
+        roi, win, cote = _window_means(cums, lo, k)
+        for col, values, scale in ((f"ROI_{suffix}", roi, 100), (f"Reussite_{suffix}", win, 100), (f"Cote_{suffix}", cote, 1)):
+            # Valeur du dernier pari réglé (NaN avant le premier)
+            series = np.full(n, np.nan)
+            series[pos] = values * scale
+            out[col] = pd.Series(series, index=df.index).ffill().to_numpy()
+
+    total = df["Total_Bankroll"].to_numpy(dtype="float64") if "Total_Bankroll" in df.columns else np.cumsum(gains)
+    peak = np.maximum.accumulate(np.maximum(total, 0.0))  # bankroll de départ (0) comprise
+    out["Drawdown"] = peak - total
+    streak = losing_streaks(lost, won | lost)
+    out["Serie_Pertes"] = streak
+
+    last = out.iloc[-1]
+    summary = {"roi_n": last["ROI_N"], "win_rate_n": last["Reussite_N"], "avg_odds_n": last["Cote_N"],
+               "roi_days": last["ROI_Jours"], "win_rate_days": last["Reussite_Jours"], "avg_odds_days": last["Cote_Jours"],
+               "drawdown": float(last["Drawdown"]), "max_drawdown": float(out["Drawdown"].max()),
+               "losing_streak": int(streak[-1]), "max_losing_streak": int(streak.max()),
+               "alert": int(streak[-1]) >= 2}  # signal "2 échecs"
+    return out, summary
@@ -0,0 +1,83 @@
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import data
+import store
+
+# ==============================================================================
+# BENCH : latence d'une modification dans l'éditeur en fonction de la taille de l'historique
+# python -m benchmarks.bench_edit [1000 10000 100000 ...]
+# ==============================================================================
+
+REPEAT = 20
+COLUMNS = ["Date", "Equipe", "Type_Over", "Cote", "Resultat"]
+
+
+def make_history(n, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2026-06-01") - pd.to_timedelta(np.sort(rng.integers(0, 3 * 365, n)), unit="D")
+    return pd.DataFrame({
+        "Date": dates.strftime("%Y-%m-%d"),
+        "Equipe": rng.choice(["Napoli", "Lille", "Monaco", "Inter", "Lazio"], n),
+        "Type_Over": rng.choice(["+1.5", "+2.5"], n),
+        "Cote": rng.uniform(1.05, 2.5, n).round(2),
+        "Resultat": rng.choice(["Gagné", "Perdu", "Remboursé", "En attente"], n, p=[0.6, 0.3, 0.02, 0.08]),
+    })
+
+
+def median_ms(fn, setup=lambda i: i):
+    # setup(i) n'est pas chronométré ; son résultat est passé à fn
+    times = []
+    for i in range(REPEAT):
+        arg = setup(i)
+        t = time.perf_counter()
+        fn(arg)
+        times.append((time.perf_counter() - t) * 1000)
+    return float(np.median(times))
+
+
+def editor_page(path, i):
+    # Première page de la stratégie telle que l'affiche l'application, avec un résultat réellement changé
+    page = data.bankroll_index.window(path, None, None, required=COLUMNS, rows=slice(0, 50))
+    edited = page.copy()
+    row = i % len(page)
+    edited.iloc[row, edited.columns.get_loc("Resultat")] = "Gagné" if page.iloc[row]["Resultat"] == "Perdu" else "Perdu"
+    return page, edited
+
+
+def run(sizes):
+    print(f"{'lignes':>10} | {'save_from_editor (ms)':>21} | {'patch seul (ms)':>15} | {'réécriture complète (ms)':>24}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            path = os.path.join(tmp, f"hist_{n}.csv")
+            make_history(n).to_csv(path, index=False)
+            # Index chauds, comme dans l'application après le premier affichage des pages
+            data.date_index.on({"bench": path}, datetime.date.today())
+            data.monthly_rollups.table(path)
+
+            # Chemin de l'application : patch journalisé + mise à jour des index
+            def save(p):
+                assert data.save_from_editor(p[1], path, COLUMNS, p[0], p[0].attrs["version"]), "rien d'écrit"
+            editor = median_ms(save, lambda i: editor_page(path, i))
+            # Le patch seul (stockage)
+            patch = median_ms(lambda i: store.patch_rows(path, {i: {"Resultat": "Gagné"}}))
+
+            # Ancien chemin : relecture + réécriture de tout le fichier
+            def rewrite(i):
+                df = pd.read_csv(path)
+                df.at[i, "Resultat"] = "Perdu"
+                df.to_csv(path, index=False)
+            full = median_ms(rewrite)
+            print(f"{n:>10} | {editor:>21.2f} | {patch:>15.2f} | {full:>24.2f}")
+
+
+if __name__ == "__main__":
+    store.JOURNAL_MAX_OPS = 10 ** 9  # pas de compaction pendant la mesure
+    run([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000])
@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import data
+from benchmarks.bench_edit import make_history
+
+# ==============================================================================
+# BENCH : chargement à froid des 6 stratégies (pages agrégées), séquentiel vs pools
+# python -m benchmarks.bench_load [lignes par fichier ...]
+# ==============================================================================
+
+N_FILES = 6
+REPEAT = 3
+MODES = [("séquentiel", 1, "thread"), ("threads x2", 2, "thread"), ("threads x4", 4, "thread"),
+         ("threads x6", 6, "thread"), ("processus x6", 6, "process")]
+
+
+def cold_ms(paths, workers, pool):
+    times = []
+    for _ in range(REPEAT):
+        data.frame_cache.clear()
+        t = time.perf_counter()
+        data.load_strategies(paths, workers, pool)
+        times.append((time.perf_counter() - t) * 1000)
+    return float(np.median(times))
+
+
+def run(sizes):
+    print(f"{'lignes/fichier':>14} | " + " | ".join(f"{name:>13}" for name, _, _ in MODES))
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            paths = []
+            for i in range(N_FILES):
+                path = os.path.join(tmp, f"strat_{n}_{i}.csv")
+                make_history(n, seed=i).to_csv(path, index=False)
+                paths.append(path)
+            ref = data.load_strategies(paths, 1)
+            for _, workers, pool in MODES:  # mêmes frames quel que soit le mode
+                data.frame_cache.clear()
+                got = data.load_strategies(paths, workers, pool)
+                assert all(got[p].equals(ref[p]) for p in paths)
+            print(f"{n:>14} | " + " | ".join(f"{cold_ms(paths, w, p):>10.0f} ms" for _, w, p in MODES))
+
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or [10_000, 100_000, 500_000])
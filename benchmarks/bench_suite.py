@@ -0,0 +1,138 @@
+import argparse
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import data
+import store
+from bankroll import calculate_bankroll
+from benchmarks.synth import STRATEGY_FILES, write_strategies
+
+# ==============================================================================
+# BENCH : chemins chauds de l'application, sans Streamlit
+# python -m benchmarks.bench_suite [--sizes 1000 100000 ...] [--save base.json] [--compare base.json]
+# ==============================================================================
+# Pour chaque taille (lignes par stratégie) : les 6 fichiers de l'application sont générés
+# (benchmarks/synth.py) puis chaque cas est chronométré (médiane), et rejoué une fois sous
+# tracemalloc pour le pic mémoire. Le backend est celui de BANKROLL_BACKEND.
+
+REPEAT = 5
+THRESHOLD = 0.20  # +20 % de temps ou de mémoire = régression
+RECAP = {f: f for f in STRATEGY_FILES if f != "home_draw.csv"}  # mêmes stratégies que page_recap
+REQUIRED = ["Date", "Equipe", "Type_Over", "Cote", "Resultat"]
+
+
+def _reset():
+    data.frame_cache.clear()
+    for index in data._indexes: index._by_file.clear()
+
+
+def _cases():
+    # nom -> (préparation, mesure) ; la préparation n'est pas chronométrée
+    main = "paris_overs.csv"
+    start, end = datetime.date(2000, 1, 1), datetime.date(2100, 1, 1)
+    counter = iter(range(10 ** 9))
+
+    def edit_setup():
+        page = data.bankroll_index.window(main, start, end, [], REQUIRED, slice(0, 50))
+        edited = page.copy()
+        row = next(counter) % len(page)
+        # Toujours une vraie modification (sinon save_from_editor n'écrit rien)
+        edited.iloc[row, edited.columns.get_loc("Resultat")] = "Gagné" if page.iloc[row]["Resultat"] == "Perdu" else "Perdu"
+        return page, edited
+
+    def edit(p):
+        saved = data.save_from_editor(p[1], main, REQUIRED, p[0], p[0].attrs["version"])
+        assert saved, "save_from_editor n'a rien écrit"
+
+    return {
+        "clean_and_read_csv": (_reset, lambda _: data.clean_and_read_csv(main)),
+        "calculate_bankroll": (lambda: data.clean_and_read_csv(main), calculate_bankroll),
+        "save_from_editor": (edit_setup, edit),
+        "add_new_bet": (lambda: None, lambda _: data.add_new_bet(main, {
+            "Date": "2026-06-01", "Equipe": "Bench", "Type_Over": "+1.5", "Cote": 1.5, "Resultat": "En attente"})),
+        "recap (froid)": (_reset, lambda _: data.monthly_rollups.recap(RECAP)),
+        "recap (filtre +1.5)": (lambda: data.monthly_rollups.recap(RECAP),
+                                lambda _: data.monthly_rollups.recap(RECAP, {"paris_overs.csv": ["+1.5"]})),
+    }
+
+
+def _measure(setup, fn):
+    times = []
+    for _ in range(REPEAT):
+        arg = setup()
+        t = time.perf_counter()
+        fn(arg)
+        times.append(time.perf_counter() - t)
+    arg = setup()
+    tracemalloc.start()
+    fn(arg)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return float(np.median(times)), peak
+
+
+def run(sizes):
+    results = {}
+    cwd = os.getcwd()
+    store.JOURNAL_MAX_OPS = 10 ** 9  # pas de compaction en arrière-plan pendant la mesure
+    print(f"backend {store.BACKEND}")
+    print(f"{'cas':<22} {'lignes':>10} | {'médiane (ms)':>12} | {'lignes/s':>12} | {'pic (Mo)':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            for n in sizes:
+                folder = os.path.join(tmp, str(n))
+                os.makedirs(folder)
+                os.chdir(folder)
+                paths = write_strategies(folder, n)
+                if store.BACKEND != "csv": list(store.migrate(list(paths), "csv", store.BACKEND))
+                _reset()
+                for name, (setup, fn) in _cases().items():
+                    seconds, peak = _measure(setup, fn)
+                    results[f"{name}@{n}"] = {"ms": seconds * 1000, "rows_per_s": n / seconds if seconds else 0.0,
+                                              "peak_mb": peak / 2 ** 20}
+                    r = results[f"{name}@{n}"]
+                    print(f"{name:<22} {n:>10} | {r['ms']:>12.2f} | {r['rows_per_s']:>12,.0f} | {r['peak_mb']:>9.1f}")
+                _reset()
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    # Renvoie les régressions : [(cas, métrique, référence, mesure)]
+    regressions = []
+    for key, r in results.items():
+        ref = baseline.get(key)
+        if ref is None: continue
+        for metric in ("ms", "peak_mb"):
+            if ref[metric] > 0 and r[metric] > ref[metric] * (1 + threshold):
+                regressions.append((key, metric, ref[metric], r[metric]))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark des chemins chauds (sans Streamlit)")
+    parser.add_argument("--sizes", nargs="*", type=int, default=[1_000, 10_000, 100_000])
+    parser.add_argument("--save", help="enregistre les résultats comme référence (JSON)")
+    parser.add_argument("--compare", help="compare à une référence enregistrée (JSON)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    results = run(args.sizes)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f: json.dump(results, f, indent=1)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f: baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for key, metric, ref, got in regressions:
+            print(f"RÉGRESSION {key} {metric} : {ref:.2f} -> {got:.2f} ({got / ref - 1:+.0%})")
+        if not regressions: print(f"Aucune régression (seuil {args.threshold:.0%})")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# ==============================================================================
+# HISTORIQUES SYNTHÉTIQUES (un schéma par type de page)
+# ==============================================================================
+# Même forme que les CSV de l'application : du plus récent au plus ancien, dates surtout en
+# AAAA-MM-JJ avec une part de formats "à la main" (JJ/MM/AAAA, horodatage, vide), tous les
+# résultats possibles, Type_Over parfois sans le "+" (cas corrigé par la page Overs).
+
+TEAMS = ["Napoli", "Lille", "Monaco", "Inter", "Lazio", "Feyenoord", "Young Boys", "Botafogo",
+         "Rayo Vallecano", "Fortuna Düsseldorf", "Kasımpasa", "Velez ", "Delfin SC", "Reggiana "]
+RESULTS = ["Gagné", "Perdu", "Remboursé", "En attente"]
+RESULT_P = [0.6, 0.3, 0.02, 0.08]
+
+# schéma -> (colonne propre à la stratégie, valeurs possibles)
+SCHEMAS = {
+    "overs": ("Type_Over", ["+1.5", "+2.5", "1.5", "2.5"]),
+    "stats": ("Type_Pari", ["LTD", "-3.5 buts", "Over 2.5", "BTTS"]),
+    "infos": ("Infos", ["Home or draw", "+1.5 buts", "Analyse", ""]),
+    "simple": (None, None),
+}
+
+# Fichiers de l'application -> schéma
+STRATEGY_FILES = {
+    "paris_overs.csv": "overs",
+    "stats_max.csv": "stats",
+    "home_draw.csv": "infos",
+    "prono_or.csv": "infos",
+    "cia_2echec.csv": "simple",
+    "moy_glissante_2e.csv": "simple",
+}
+
+
+def _dates(rng, n, end, mixed):
+    # n dates décroissantes sur ~3 ans, rendues en texte (vectorisé, utilisable à 10M lignes)
+    days = np.sort(rng.integers(0, 3 * 365, n))
+    dates = (np.datetime64(end, "D") - days.astype("timedelta64[D]"))
+    text = dates.astype(str).astype(object)
+    k = int(n * mixed)
+    if k:
+        pick = rng.choice(n, k, replace=False)
+        fmt = rng.integers(0, 3, k)
+        iso = dates[pick].astype(str)
+        dmy = [f"{s[8:10]}/{s[5:7]}/{s[0:4]}" for s in iso[fmt == 0]]
+        text[pick[fmt == 0]] = dmy
+        text[pick[fmt == 1]] = [s + " 00:00:00" for s in iso[fmt == 1]]
+        text[pick[fmt == 2]] = ""
+    return text
+
+
+def make_strategy(schema, n, seed=0, end="2026-06-01", mixed=0.02):
+    rng = np.random.default_rng(seed)
+    extra_col, extra_values = SCHEMAS[schema]
+    cols = {"Date": _dates(rng, n, end, mixed), "Equipe": rng.choice(TEAMS, n)}
+    if extra_col: cols[extra_col] = rng.choice(extra_values, n)
+    cols["Cote"] = rng.uniform(1.01, 2.6, n).round(2)
+    cols["Resultat"] = rng.choice(RESULTS, n, p=RESULT_P)
+    return pd.DataFrame(cols)
+
+
+def write_strategies(folder, n, seed=0, mixed=0.02):
+    # Les 6 fichiers de l'application, n lignes chacun ; renvoie {fichier: chemin}
+    paths = {}
+    for i, (name, schema) in enumerate(STRATEGY_FILES.items()):
+        path = os.path.join(folder, name)
+        make_strategy(schema, n, seed + i, mixed=mixed).to_csv(path, index=False)
+        paths[name] = path
+    return paths
@@ -0,0 +1,847 @@
+import copy
+import datetime
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+import profiling
+import store
+from bankroll import (gain_vector, merge_rollups, monthly_gains, odds_vector, recap_pivot, rolling_analytics,
+                      rollup, rollup_rows, sub_type, window_kpis, window_sums)
+
+# ==============================================================================
+# CACHE DES FRAMES PAR STRATÉGIE
+# ==============================================================================
+# Clé = (stratégie, plage de dates), valeur gardée avec la version du fichier (store.version) :
+# une écriture sur "Prono en Or" ne rend périmées que les entrées de prono_or, les autres
+# stratégies restent en cache. Taille bornée (nb d'entrées + mémoire), éviction LRU.
+
+CACHE_MAX_ENTRIES = int(os.environ.get("BANKROLL_CACHE_ENTRIES", 32))
+CACHE_MAX_BYTES = int(os.environ.get("BANKROLL_CACHE_MB", 512)) * 1024 * 1024
+
+
+class FrameCache:
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # clé -> (version, frame, octets)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, version, loader):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                profiling.count("cache_hits")
+                return entry[1].copy()
+            self.misses += 1
+        profiling.count("cache_misses")
+
+        df = loader()
+        size = int(df.memory_usage(index=True).sum())
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (version, df, size)
+            self._bytes += size
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return df.copy()
+
+    def fresh(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] == version
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None: self._bytes -= entry[2]
+
+    def invalidate(self, file_path):
+        # Ne libère que les entrées de la stratégie écrite
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == file_path]: self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "hit_rate": self.hits / total if total else 0.0,
+                    "entries": len(self._entries), "bytes": self._bytes}
+
+
+frame_cache = FrameCache()
+
+
+# ==============================================================================
+# LECTURE / ÉCRITURE DES STRATÉGIES
+# ==============================================================================
+
+def _clean(df):
+    # Nettoyage colonnes parasites (on supprime aussi Date.1 si elle s'est créée par erreur)
+    cols_to_drop = ["ID_Tech", "Original_Idx", "Unnamed: 0", "Date.1"]
+    for bad_col in cols_to_drop:
+        if bad_col in df.columns: df = df.drop(columns=[bad_col])
+
+    if "Date" in df.columns:
+        df["Date"] = store.to_dates(df["Date"])
+        df["Date"] = df["Date"].fillna(pd.Timestamp.today())
+        df["Date"] = df["Date"].dt.normalize()
+
+    # Types compacts : float32 pour la cote, catégories pour les colonnes à peu de valeurs
+    if "Cote" in df.columns:
+        df["Cote"] = pd.to_numeric(df["Cote"], errors='coerce').fillna(0.0).astype("float32")
+    return _categories(df)
+
+def _categories(df):
+    # (re)passe en catégories les colonnes concernées, ex: après concat / modification d'une cellule
+    for col in store.CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype): df[col] = df[col].astype("category")
+    return df
+
+def _load_clean(file_path, start, end):
+    if store.exists(file_path):
+        try:
+            with profiling.stage("lecture"): df = store.read_raw(file_path, start, end)
+        except store.JournalMismatchError: raise  # à signaler : des paris en attente ont été mis de côté
+        except: return pd.DataFrame()
+        with profiling.stage("nettoyage"): return _clean(df)
+    return pd.DataFrame()
+
+def clean_and_read_csv(file_path, start=None, end=None):
+    # Version lue AVANT le chargement : une écriture concurrente rendra l'entrée périmée
+    version = store.version(file_path)
+    return frame_cache.get((file_path, start, end), version, lambda: _load_clean(file_path, start, end))
+
+def iter_clean(file_path, chunksize=50_000):
+    # Même nettoyage que clean_and_read_csv, tranche par tranche et sans cache (rapports en flux, cf. report.py)
+    if not store.exists(file_path): return
+    for chunk in store.read_chunks(file_path, chunksize): yield _clean(chunk)
+
+# Chargement de plusieurs stratégies (pages agrégées) : un pool de threads par défaut,
+# de processus avec BANKROLL_LOAD_POOL=process, séquentiel avec BANKROLL_LOAD_WORKERS=1
+LOAD_WORKERS = int(os.environ.get("BANKROLL_LOAD_WORKERS", min(8, os.cpu_count() or 1)))
+LOAD_POOL = os.environ.get("BANKROLL_LOAD_POOL", "thread")
+
+def _load_sequential(file_paths):
+    return {fp: clean_and_read_csv(fp) for fp in file_paths}
+
+def _load_processes(file_paths, workers):
+    # Les processus lisent et nettoient ; le résultat passe ensuite par le cache comme en séquentiel
+    versions = {fp: store.version(fp) for fp in file_paths}
+    missing = [fp for fp in file_paths if not frame_cache.fresh((fp, None, None), versions[fp])]
+    loaded = {}
+    if missing:
+        with ProcessPoolExecutor(min(workers, len(missing))) as pool:
+            loaded = dict(zip(missing, pool.map(partial(_load_clean, start=None, end=None), missing)))
+    # (entrée évincée entre-temps -> relue ici)
+    return {fp: frame_cache.get((fp, None, None), versions[fp],
+                                lambda fp=fp: loaded[fp] if fp in loaded else _load_clean(fp, None, None))
+            for fp in file_paths}
+
+def load_strategies(file_paths, workers=None, pool=None):
+    # Mêmes frames que clean_and_read_csv appelé en boucle, lectures en parallèle
+    file_paths = list(dict.fromkeys(file_paths))
+    workers = LOAD_WORKERS if workers is None else workers
+    pool = pool or LOAD_POOL
+    if workers <= 1 or len(file_paths) <= 1: return _load_sequential(file_paths)
+    try:
+        if pool == "process": return _load_processes(file_paths, workers)
+        with ThreadPoolExecutor(min(workers, len(file_paths))) as executor:
+            return dict(zip(file_paths, executor.map(profiling.bind(clean_and_read_csv), file_paths)))
+    except RuntimeError:
+        # Pool indisponible (arrêt de l'interpréteur, processus fils tué...) -> lecture séquentielle
+        return _load_sequential(file_paths)
+
+def _write(file_path, write, **event):
+    # Écriture + mise à jour des structures dérivées (index...) sans tout recharger,
+    # à condition qu'elles soient à jour juste avant l'écriture. Les deux versions sont lues
+    # sous le verrou d'écriture : aucune écriture d'un autre processus ne peut s'intercaler.
+    with profiling.stage("écriture"), store.write_lock(file_path):
+        before = store.version(file_path)
+        write()
+        after = store.version(file_path)
+    frame_cache.invalidate(file_path)
+    with profiling.stage("mise à jour index"):
+        for index in _indexes: index.after_write(file_path, before, after, **event)
+
+def save_from_editor(edited_df, file_path, cols_to_save, displayed_df, expected_version=None):
+    # Seules les cellules réellement modifiées sont journalisées (patchs par Original_Idx).
+    # expected_version = version des données affichées : store.StaleVersionError si elles ont changé depuis
+    changes = store.editor_changes(displayed_df, edited_df, cols_to_save)
+    if not changes: return False
+    _write(file_path, lambda: store.patch_rows(file_path, changes, expected_version), changes=changes)
+    return True
+
+def add_new_bet(file_path, new_data):
+    # Ajout en fin de journal (O(1)), fusionné plus tard dans le CSV
+    _write(file_path, lambda: store.append_row(file_path, new_data), rows=[new_data])
+
+
+# ==============================================================================
+# COLONNES DES INDEX (tableaux partagés entre versions)
+# ==============================================================================
+# Les index ci-dessous gardent les lignes d'une stratégie colonne par colonne (tableaux numpy,
+# codes + libellés pour les catégories) et ne reconstruisent un DataFrame que pour les lignes
+# demandées. Les versions successives d'une entrée (cf. _Derived.after_write) partagent des
+# tampons à capacité dont chacune ne lit que ses n premières cases.
+# Un ajout en fin écrit au-delà (O(1) amorti) ; une insertion au milieu ou une cellule modifiée
+# travaille sur une copie.
+
+class _Buffer:
+    __slots__ = ("data", "used")
+
+    def __init__(self, data, used=None):
+        self.data = data
+        self.used = len(data) if used is None else used  # cases écrites (par la version la plus avancée)
+
+
+def _extend(buf, n, values):
+    # Tampon de la version suivante : les n premières cases de buf puis values
+    k = len(values)
+    if buf.used != n or n + k > len(buf.data):
+        data = np.empty(max(2 * (n + k), 16), dtype=buf.data.dtype)
+        data[:n] = buf.data[:n]
+        buf = _Buffer(data, n)
+    buf.data[n:n + k] = values
+    buf.used = n + k
+    return buf
+
+def _insert(buf, n, at, values):
+    # values insérées aux positions at (croissantes, cf. np.insert) ; toutes en fin -> _extend
+    if len(at) and at[0] == n: return _extend(buf, n, values)
+    return _Buffer(np.insert(buf.data[:n], at, values))
+
+def _blank(buf, meta, k):
+    # k cases vides au format d'une colonne
+    if isinstance(meta, pd.Index): return np.full(k, -1, dtype=np.int32)
+    dtype = buf.data.dtype
+    return np.full(k, np.datetime64("NaT") if dtype.kind == "M" else np.nan, dtype=dtype)
+
+def _new_column(s, n):
+    # Colonne absente jusqu'ici : n cases vides au format de la Series s
+    if isinstance(s.dtype, pd.CategoricalDtype): buf, meta = _Buffer(np.empty(0, dtype=np.int32)), s.cat.categories[:0]
+    else: buf, meta = _Buffer(np.empty(0, dtype=s.to_numpy().dtype)), s.dtype
+    return _Buffer(_blank(buf, meta, n)), meta
+
+def _encode(buf, meta, s):
+    # Valeurs de s au format d'une colonne : même type, ou codes (libellés inconnus ajoutés en fin)
+    if not isinstance(meta, pd.Index): return s.to_numpy().astype(buf.data.dtype, copy=False), meta
+    values = s.astype(object).to_numpy()
+    codes = meta.get_indexer(values)
+    unknown = pd.unique(values[(codes == -1) & pd.notna(values)])
+    if len(unknown):
+        meta = meta.append(pd.Index(unknown))
+        codes = meta.get_indexer(values)
+    return codes.astype(np.int32), meta
+
+
+class _Columns:
+    def __init__(self, n, cols):
+        self.n = n
+        self.cols = cols  # nom -> (_Buffer, libellés si catégorie sinon dtype pandas)
+
+    @classmethod
+    def of(cls, df):
+        cols = {}
+        for c in df.columns:
+            s = df[c]
+            if isinstance(s.dtype, pd.CategoricalDtype): cols[c] = (_Buffer(s.cat.codes.to_numpy().astype(np.int32)), s.cat.categories)
+            else: cols[c] = (_Buffer(s.to_numpy()), s.dtype)
+        return cls(len(df), cols)
+
+    def values(self, col):
+        # Tableau de la colonne (codes pour une catégorie), en lecture seule
+        return self.cols[col][0].data[:self.n]
+
+    def frame(self, pos, index=None, columns=None):
+        # Lignes aux positions pos (tableau d'entiers), avec leurs types d'origine
+        out = {}
+        for c in (self.cols if columns is None else [c for c in columns if c in self.cols]):
+            buf, meta = self.cols[c]
+            values = buf.data[pos]
+            out[c] = pd.Categorical.from_codes(values, categories=meta) if isinstance(meta, pd.Index) else pd.array(values, dtype=meta)
+        return pd.DataFrame(out, index=index)
+
+    def inserted(self, at, new):
+        # Lignes du frame nettoyé new insérées aux positions at ; colonnes nouvelles complétées à vide
+        # (même ordre de colonnes que pd.concat([new, lignes]))
+        cols = {}
+        for c in dict.fromkeys([*new.columns, *self.cols]):
+            buf, meta = self.cols[c] if c in self.cols else _new_column(new[c], self.n)
+            if c in new.columns: values, meta = _encode(buf, meta, new[c])
+            else: values = _blank(buf, meta, len(new))
+            cols[c] = (_insert(buf, self.n, at, values), meta)
+        return _Columns(self.n + len(new), cols)
+
+    def with_cells(self, col, pos, s):
+        # Cellules pos de col remplacées par les valeurs de s : seule cette colonne est copiée
+        cols = dict(self.cols)
+        buf, meta = cols[col] if col in cols else _new_column(s, self.n)
+        values, meta = _encode(buf, meta, s)
+        data = buf.data[:self.n].copy()
+        data[pos] = values
+        cols[col] = (_Buffer(data), meta)
+        return _Columns(self.n, cols)
+
+    def taken(self, idx):
+        return _Columns(len(idx), {c: (_Buffer(buf.data[idx]), meta) for c, (buf, meta) in self.cols.items()})
+
+
+class _Prefix:
+    # Sommes cumulées précédées d'un 0 (cf. bankroll.prefix_sums) sur m paris
+    def __init__(self, bufs, m):
+        self.bufs, self.m = bufs, m
+
+    @classmethod
+    def of(cls, contrib):
+        return cls({k: _Buffer(np.concatenate([[0], np.cumsum(v)])) for k, v in contrib.items()}, len(contrib["Nb"]))
+
+    def sums(self):
+        return {k: buf.data[:self.m + 1] for k, buf in self.bufs.items()}
+
+    def extended(self, contrib):
+        # contrib = paris ajoutés en fin : O(nb ajoutés)
+        return _Prefix({k: _extend(buf, self.m + 1, np.cumsum(np.concatenate([[buf.data[self.m]], contrib[k]]))[1:])
+                        for k, buf in self.bufs.items()}, self.m + len(contrib["Nb"]))
+
+    def recomputed(self, start, contrib):
+        # contrib = paris à partir de la position start (jusqu'au dernier) : le début est repris tel quel
+        return _Prefix({k: _Buffer(np.concatenate([buf.data[:start], np.cumsum(np.concatenate([[buf.data[start]], contrib[k]]))]))
+                        for k, buf in self.bufs.items()}, start + len(contrib["Nb"]))
+
+
+# ==============================================================================
+# INDEX DATE -> PARIS (toutes stratégies)
+# ==============================================================================
+# Par stratégie : les lignes triées par date puis par seq (numéro stable, seq = n-1-Original_Idx).
+# Une journée / une plage = deux recherches dichotomiques. L'index est reconstruit si la stratégie
+# a changé ailleurs (autre session, autre processus), sinon les ajouts et modifications faits ici
+# sont appliqués directement : un pari est inséré à sa place (en fin dans le cas courant, daté du
+# dernier jour ou après), une cellule modifiée ne déplace sa ligne que si c'est la date. Une entrée
+# n'est jamais modifiée en place : une écriture construit l'entrée suivante (added / patched).
+
+class _StrategyDays:
+    def __init__(self, df, version):
+        self.version = version
+        self.n = len(df)
+        seq = np.arange(self.n - 1, -1, -1)
+        order = np.lexsort((seq, df["Date"].to_numpy()))
+        self.table = _Columns.of(df.iloc[order])
+        self.seq = _Buffer(seq[order])
+
+    @property
+    def dates(self):
+        return self.table.values("Date")
+
+    @property
+    def seqs(self):
+        return self.seq.data[:self.n]
+
+    def frame(self, pos, columns=None):
+        # Lignes aux positions pos de l'ordre trié, indexées par seq
+        return self.table.frame(pos, self.seqs[pos], columns)
+
+    def between(self, start, end):
+        lo = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start)), side="left")
+        hi = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end)), side="right")
+        # Dans une journée : du plus récent (seq le plus grand) au plus ancien, comme dans les pages
+        return self.frame(lo + np.lexsort((-self.seqs[lo:hi], self.dates[lo:hi])))
+
+    def added(self, new_rows, version):
+        new = _clean(pd.DataFrame(new_rows))
+        dates = new["Date"].to_numpy().astype(self.dates.dtype)
+        order = np.argsort(dates, kind="stable")
+        # Après les paris du même jour (seq plus grand) : en fin si daté du dernier jour ou après
+        at = np.searchsorted(self.dates, dates[order], side="right")
+        entry = copy.copy(self)
+        entry.version, entry.n = version, self.n + len(new)
+        entry.table = self.table.inserted(at, new.iloc[order])
+        entry.seq = _insert(self.seq, self.n, at, np.arange(self.n, self.n + len(new))[order])
+        entry._inserted(self, at)
+        return entry
+
+    def patched(self, changes, version):
+        where = np.empty(self.n, dtype=np.int64)
+        where[self.seqs] = np.arange(self.n)  # seq -> position
+        cells = {}  # colonne -> {position: valeur}
+        for pos, row in changes.items():
+            for col, val in row.items(): cells.setdefault(col, {})[int(where[self.n - 1 - pos])] = val
+        entry = copy.copy(self)
+        entry.version = version
+        for col, values in cells.items():
+            # Même conversion que _clean, appliquée aux seules cellules modifiées
+            entry.table = entry.table.with_cells(col, list(values), _clean(pd.DataFrame({col: list(values.values())}))[col])
+        entry._patched(self, cells)
+        if "Date" in cells: entry._move(np.array(sorted(cells["Date"]), dtype=np.int64))
+        return entry
+
+    def _inserted(self, prev, at):
+        pass
+
+    def _patched(self, prev, cells):
+        pass
+
+    def _move(self, moved):
+        # Lignes dont la date a changé : retirées puis réinsérées à leur place (date, seq), sans tout retrier
+        dates, seqs = self.dates, self.seqs
+        keep = np.delete(np.arange(self.n), moved)
+        kept_dates, kept_seqs = dates[keep], seqs[keep]
+        moved = moved[np.lexsort((seqs[moved], dates[moved]))]
+        lo = np.searchsorted(kept_dates, dates[moved], side="left")
+        hi = np.searchsorted(kept_dates, dates[moved], side="right")
+        at = [l + np.searchsorted(kept_seqs[l:h], s) for l, h, s in zip(lo, hi, seqs[moved])]
+        self._take(np.insert(keep, at, moved))
+
+    def _take(self, idx):
+        seqs = self.seqs[idx]
+        self.table = self.table.taken(idx)
+        self.seq = _Buffer(seqs)
+
+
+class _Derived:
+    # Structure dérivée par stratégie, marquée par la version du fichier (cf. _write)
+    entry_class = None
+
+    def __init__(self):
+        self._by_file = {}
+        self._lock = threading.Lock()
+
+    def _strategy(self, file_path):
+        version = store.version(file_path)
+        with self._lock:
+            entry = self._by_file.get(file_path)
+            if entry is not None and entry.version == version: return entry
+        df = clean_and_read_csv(file_path)
+        if "Date" not in df.columns: df["Date"] = pd.Series(dtype="datetime64[ns]")
+        with profiling.stage(f"construction {type(self).__name__}"): entry = self.entry_class(df, version)
+        with self._lock: self._by_file[file_path] = entry
+        return entry
+
+    def warm(self, file_paths):
+        # Stratégies absentes ou périmées : lectures groupées en parallèle avant la construction
+        stale = []
+        for file_path in file_paths:
+            entry = self._by_file.get(file_path)
+            if entry is None or entry.version != store.version(file_path): stale.append(file_path)
+        if len(stale) > 1: load_strategies(stale)
+
+    def after_write(self, file_path, before, after, rows=None, changes=None):
+        # L'entrée courante peut être en cours de lecture dans une autre session : on construit
+        # la suivante à côté et on remplace la référence sous le verrou
+        with self._lock:
+            entry = self._by_file.get(file_path)
+            if entry is None: return
+            if entry.version != before or not (rows or changes):
+                # Déjà périmé, ou écriture en masse (import) : reconstruit à la prochaine lecture
+                del self._by_file[file_path]
+                return
+            try:
+                if rows: entry = entry.added(rows, after)
+                if changes: entry = entry.patched(changes, after)
+                self._by_file[file_path] = entry
+            except Exception:
+                del self._by_file[file_path]
+
+
+class DateIndex(_Derived):
+    entry_class = _StrategyDays
+
+    def between(self, strategies, start, end, pending_only=False):
+        # strategies = {nom affiché: fichier} ; renvoie les paris de [start, end] avec la colonne "Stratégie"
+        parts = []
+        self.warm(strategies.values())
+        for name, file_path in strategies.items():
+            rows = self._strategy(file_path).between(start, end)
+            if pending_only and "Resultat" in rows.columns: rows = rows[rows["Resultat"] == "En attente"]
+            if rows.empty: continue
+            rows.insert(0, "Stratégie", name)
+            parts.append(rows)
+        if not parts: return pd.DataFrame()
+        return pd.concat(parts, ignore_index=True)
+
+    def on(self, strategies, day):
+        return self.between(strategies, day, day)
+
+    def pending(self, strategies, days, from_date=None):
+        # Paris "En attente" des N prochains jours (aujourd'hui compris)
+        start = pd.Timestamp(from_date or datetime.date.today()).normalize()
+        out = self.between(strategies, start, start + pd.Timedelta(days=days - 1), pending_only=True)
+        return out.sort_values("Date", kind="stable", ignore_index=True) if not out.empty else out
+
+
+date_index = DateIndex()
+
+
+# ==============================================================================
+# AGRÉGATS MENSUELS MATÉRIALISÉS (Récapitulatif Global)
+# ==============================================================================
+# Par stratégie : table (mois, sous-type) -> gains, nb, gagnés, cotes (cf. bankroll.rollup),
+# plus les colonnes utiles de chaque ligne (dans l'ordre des seq) pour pouvoir retirer l'ancienne
+# contribution d'une ligne modifiée. Le récap et ses filtres de simulation sont lus dans ces tables.
+
+class _StrategyMonths:
+    KEEP = ["Date", "Type_Over", "Cote", "Resultat"]
+
+    def __init__(self, df, version):
+        self.version = version
+        self.n = len(df)
+        base = df[[c for c in self.KEEP if c in df.columns]].iloc[::-1]
+        self.has_sub_type = "Type_Over" in df.columns
+        self.base = _Columns.of(base)
+        self.table = rollup(rollup_rows(base))
+
+    def added(self, new_rows, version):
+        new = _clean(pd.DataFrame(new_rows))
+        new = new[[c for c in self.KEEP if c in new.columns]]
+        entry = copy.copy(self)
+        entry.version, entry.n = version, self.n + len(new)
+        entry.base = self.base.inserted(np.full(len(new), self.n), new)
+        entry.table = merge_rollups(self.table, rollup(rollup_rows(new)))
+        return entry
+
+    def patched(self, changes, version):
+        seqs = np.array([self.n - 1 - pos for pos in changes], dtype=np.int64)
+        cells = {}  # colonne -> {seq: valeur}
+        for pos, row in changes.items():
+            for col, val in row.items():
+                if col in self.KEEP: cells.setdefault(col, {})[self.n - 1 - pos] = val
+        base = self.base
+        for col, values in cells.items():
+            base = base.with_cells(col, list(values), _clean(pd.DataFrame({col: list(values.values())}))[col])
+        old, new = rollup_rows(self.base.frame(seqs)), rollup_rows(base.frame(seqs))
+        entry = copy.copy(self)
+        entry.version = version
+        entry.table = merge_rollups(merge_rollups(self.table, rollup(old), sign=-1), rollup(new))
+        entry.base = base
+        return entry
+
+
+class MonthlyRollups(_Derived):
+    entry_class = _StrategyMonths
+
+    def table(self, file_path):
+        return self._strategy(file_path).table
+
+    def recap(self, strategies, sub_types=None):
+        # strategies = {nom affiché: fichier} ; sub_types = {nom affiché: sous-types retenus}
+        sub_types = sub_types or {}
+        gains = {}
+        self.warm(strategies.values())
+        for name, file_path in strategies.items():
+            entry = self._strategy(file_path)
+            # Filtre ignoré si la stratégie n'a pas de colonne Type_Over (comme avant)
+            gains[name] = monthly_gains(entry.table, sub_types.get(name) if entry.has_sub_type else None)
+        with profiling.stage("pivot"): return recap_pivot(gains)
+
+
+monthly_rollups = MonthlyRollups()
+
+
+# ==============================================================================
+# INDEX BANKROLL (sommes cumulées par date, pages stratégie)
+# ==============================================================================
+# Par stratégie : les lignes dans l'ordre de calcul de calculate_bankroll (Date croissante, puis
+# du plus ancien au plus récent), la contribution de chaque pari (gain, gagné, cote, sous-type) et
+# les sommes cumulées gains / nb / gagnés / cotes, globales et par Type_Over. Les KPIs d'une plage
+# "Du / Au" = deux dichotomies ; le tableau reprend la tranche correspondante et son cumul est
+# recalculé sur la seule fenêtre (valeurs exactes). Après une écriture, les sommes cumulées ne sont
+# recalculées qu'à partir de la première ligne touchée : un pari ajouté en fin ne coûte que O(1).
+
+class _StrategyBankroll(_StrategyDays):
+    CALC = ["Resultat", "Cote", "Type_Over"]
+
+    def __init__(self, df, version):
+        super().__init__(df, version)
+        self._numbers()
+
+    @property
+    def gains(self):
+        return self.calc.values("Gain_Unit")
+
+    def _contributions(self, pos):
+        # Par pari (positions pos) : gain, gagné, cote, sous-type, mêmes conversions que calculate_bankroll
+        rows = self.frame(pos, self.CALC)
+        resultat = rows["Resultat"] if "Resultat" in rows.columns else pd.Series("En attente", index=rows.index)
+        cote = rows["Cote"] if "Cote" in rows.columns else pd.Series(0.0, index=rows.index)
+        return pd.DataFrame({"Gain_Unit": gain_vector(resultat, cote), "Gagnes": (resultat == "Gagné").to_numpy(dtype=np.int64),
+                             "Cotes": odds_vector(cote), "Sous_Type": pd.Categorical(sub_type(rows))})
+
+    def _sums(self, pos):
+        # Valeurs à cumuler pour les positions pos (tableau ou tranche)
+        gains = self.gains[pos]
+        return {"Gain_Unit": gains, "Nb": np.ones(len(gains), dtype=np.int64),
+                "Gagnes": self.calc.values("Gagnes")[pos], "Cotes": self.calc.values("Cotes")[pos]}
+
+    def _numbers(self):
+        self.calc = _Columns.of(self._contributions(np.arange(self.n)))
+        self.prefix = _Prefix.of(self._sums(slice(None)))
+        self._types()
+
+    def _types(self):
+        # Une sous-suite par Type_Over : (positions, dates, sommes cumulées)
+        self._rolling = None  # ((n paris, n jours), analyse glissante) : dernière combinaison demandée seulement
+        codes, labels = self.calc.values("Sous_Type"), self.calc.cols["Sous_Type"][1]
+        self.by_type = {}
+        for i, t in enumerate(labels):
+            pos = np.flatnonzero(codes == i)
+            if len(pos): self.by_type[t] = (_Buffer(pos), _Buffer(self.dates[pos]), _Prefix.of(self._sums(pos)))
+
+    def _inserted(self, prev, at):
+        if self.table.cols.keys() != prev.table.cols.keys(): return self._numbers()  # nouvelle colonne : tout est recalculé
+        self._rolling = None
+        pos = at + np.arange(len(at))  # positions des nouveaux paris
+        contrib = self._contributions(pos)
+        self.calc = prev.calc.inserted(at, contrib)
+        if at[0] < prev.n:
+            self.prefix = prev.prefix.recomputed(at[0], self._sums(slice(at[0], None)))
+            return self._types()
+        # Cas courant, paris ajoutés en fin : toutes les sommes cumulées sont prolongées
+        self.prefix = prev.prefix.extended(self._sums(pos))
+        self.by_type = dict(prev.by_type)
+        for t in pd.unique(contrib["Sous_Type"]):
+            p = pos[(contrib["Sous_Type"] == t).to_numpy()]
+            if t not in self.by_type:
+                self.by_type[t] = (_Buffer(p), _Buffer(self.dates[p]), _Prefix.of(self._sums(p)))
+                continue
+            positions, dates, prefix = self.by_type[t]
+            self.by_type[t] = (_extend(positions, prefix.m, p), _extend(dates, prefix.m, self.dates[p]), prefix.extended(self._sums(p)))
+
+    def _patched(self, prev, cells):
+        if self.table.cols.keys() != prev.table.cols.keys(): return self._numbers()
+        if not cells.keys() & set(self.CALC): return
+        self._rolling = None
+        pos = np.array(sorted(set().union(*(cells[c] for c in cells.keys() & set(self.CALC)))), dtype=np.int64)
+        contrib = self._contributions(pos)
+        for c in contrib.columns: self.calc = self.calc.with_cells(c, pos, contrib[c])
+        self.prefix = self.prefix.recomputed(pos[0], self._sums(slice(pos[0], None)))
+        if "Type_Over" in cells: return self._types()
+        # Sous-types inchangés : chaque sous-suite touchée est recalculée à partir de sa première ligne modifiée
+        self.by_type = dict(self.by_type)
+        for t in pd.unique(contrib["Sous_Type"]):
+            positions, dates, prefix = self.by_type[t]
+            sub = positions.data[:prefix.m]
+            r = np.searchsorted(sub, pos[(contrib["Sous_Type"] == t).to_numpy()][0])
+            self.by_type[t] = (positions, dates, prefix.recomputed(r, self._sums(sub[r:])))
+
+    def _take(self, idx):
+        super()._take(idx)
+        self.calc = self.calc.taken(idx)
+        changed = np.flatnonzero(idx != np.arange(len(idx)))
+        if len(changed): self.prefix = self.prefix.recomputed(changed[0], self._sums(slice(changed[0], None)))
+        self._types()
+
+    def _bounds(self, dates, start, end):
+        # Borne absente (None) = tout l'historique de ce côté
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side="left")
+        hi = len(dates) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), side="right")
+        return lo, hi
+
+    def kpis(self, start, end, sub_types=None):
+        if not sub_types: return window_kpis([window_sums(self.prefix.sums(), *self._bounds(self.dates, start, end))])
+        sums = []
+        for t in sub_types:
+            if t not in self.by_type: continue
+            _, dates, prefix = self.by_type[t]
+            sums.append(window_sums(prefix.sums(), *self._bounds(dates.data[:prefix.m], start, end)))
+        return window_kpis(sums)
+
+    def rolling(self, n_bets, n_days):
+        cached = self._rolling
+        if cached is not None and cached[0] == (n_bets, n_days): return cached[1]
+        # Même frame que calculate_bankroll(...).iloc[::-1] (ordre chronologique)
+        df = self.frame(np.arange(self.n), ["Date", "Resultat", "Cote"])
+        df.index = self.n - 1 - df.index  # Original_Idx
+        df["Gain_Unit"] = self.gains.copy()
+        df["Total_Bankroll"] = np.cumsum(self.gains)
+        result = rolling_analytics(df, n_bets, n_days)
+        self._rolling = ((n_bets, n_days), result)
+        return result
+
+    def window(self, start, end, sub_types=None):
+        lo, hi = self._bounds(self.dates, start, end)
+        pos = np.arange(lo, hi)
+        if sub_types:
+            codes = self.calc.cols["Sous_Type"][1].get_indexer(list(sub_types))
+            pos = pos[np.isin(self.calc.values("Sous_Type")[lo:hi], codes[codes >= 0])]
+        return pos, self.gains[pos]
+
+
+class BankrollIndex(_Derived):
+    entry_class = _StrategyBankroll
+
+    def count(self, file_path):
+        return self._strategy(file_path).n
+
+    def kpis(self, file_path, start, end, sub_types=None):
+        return self._strategy(file_path).kpis(start, end, sub_types)
+
+    def rolling(self, file_path, n_bets=20, n_days=30):
+        # (analyse par pari, résumé) sur tout l'historique, recalculée seulement si la stratégie a changé
+        return self._strategy(file_path).rolling(n_bets, n_days)
+
+    def window(self, file_path, start, end, sub_types=None, required=(), rows=None):
+        # Même résultat que calculate_bankroll sur les lignes filtrées (ordre d'affichage, Original_Idx, cumul).
+        # rows = tranche de l'ordre d'affichage (pagination) : seules ces lignes sont construites,
+        # le cumul reste calculé sur toute la fenêtre
+        entry = self._strategy(file_path)
+        pos, gains, running = self._display(entry, start, end, sub_types)
+        if rows is not None: pos, gains, running = pos[rows], gains[rows], running[rows]
+        return self._frame(entry, pos, gains, running, required)
+
+    def chunks(self, file_path, start, end, sub_types=None, required=(), size=50_000):
+        # La même fenêtre, construite et rendue par tranches de size lignes (export)
+        entry = self._strategy(file_path)
+        # Entrée jamais modifiée en place : une écriture pendant l'export ne mélange pas deux versions
+        pos, gains, running = self._display(entry, start, end, sub_types)
+        for i in range(0, len(pos), size):
+            yield self._frame(entry, pos[i:i + size], gains[i:i + size], running[i:i + size], required)
+
+    @staticmethod
+    def _display(entry, start, end, sub_types):
+        # Positions, gains et cumul de la fenêtre, dans l'ordre d'affichage (plus récent en premier)
+        pos, gains = entry.window(start, end, sub_types)
+        running = np.cumsum(gains)
+        return pos[::-1], gains[::-1], running[::-1]
+
+    @staticmethod
+    def _frame(entry, pos, gains, running, required):
+        df = entry.frame(pos)
+        for c in required:
+            if c not in df.columns: df[c] = ""
+        df.index = entry.n - 1 - df.index
+        df["Gain_Unit"] = gains
+        df["Original_Idx"] = df.index
+        df["Total_Bankroll"] = running
+        df.attrs["version"] = entry.version  # jeton pour save_from_editor
+        return df
+
+
+bankroll_index = BankrollIndex()
+_indexes = [date_index, monthly_rollups, bankroll_index]
+
+
+# ==============================================================================
+# IMPORT / EXPORT EN MASSE
+# ==============================================================================
+# Import : CSV ou liste collée lu par tranches, chaque ligne validée contre les colonnes de la
+# stratégie (mêmes règles que les formulaires), doublons (Date, Equipe, Cote) écartés, puis un
+# seul commit (store.append_rows). Export : la vue filtrée d'une page, écrite par tranches.
+
+IMPORT_CHUNK_ROWS = 50_000
+EXPORT_CHUNK_ROWS = 50_000
+RESULTS = ["En attente", "Gagné", "Perdu", "Remboursé"]
+OVER_TYPES = ["+1.5", "+2.5"]
+SEPARATORS = [";", "\t", ","]
+
+
+def _plain(text):
+    # "Résultat " -> "resultat" : comparaison des en-têtes et des résultats sans accents ni casse
+    text = unicodedata.normalize("NFKD", str(text).strip())
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold().replace(" ", "_")
+
+def _first_line(source):
+    if hasattr(source, "read"):
+        line = source.readline()
+        source.seek(0)
+    else:
+        with open(source, encoding="utf-8-sig") as f: line = f.readline()
+    return line.decode("utf-8-sig") if isinstance(line, bytes) else line.lstrip("\ufeff")
+
+def _import_reader(source, columns, chunksize):
+    # En-tête facultatif : sans en-tête reconnu, les champs suivent l'ordre des colonnes de la stratégie
+    line = _first_line(source)
+    sep = next((s for s in SEPARATORS if s in line), ",")
+    names = {_plain(c): c for c in columns}
+    header = [names.get(_plain(h)) for h in line.rstrip("\r\n").split(sep)]
+    options = dict(sep=sep, dtype=str, keep_default_na=False, chunksize=chunksize, skip_blank_lines=True, encoding="utf-8-sig")
+    if not any(header): return pd.read_csv(source, header=None, names=list(columns), index_col=False, **options)
+    missing = [c for c in ("Date", "Equipe", "Cote") if c in columns and c not in header]
+    if missing: raise ValueError(f"Colonnes manquantes : {', '.join(missing)}")
+    # Colonnes inconnues ignorées, les autres renommées comme dans la stratégie
+    return pd.read_csv(source, header=0, names=[h or f"_ignore_{i}" for i, h in enumerate(header)], index_col=False, **options)
+
+def _bet_keys(dates, teams, odds):
+    # Empreinte (Date, Equipe, Cote) d'un pari ; cote arrondie comme odds_vector (float32 relu)
+    keys = pd.DataFrame({"d": dates.to_numpy(dtype="datetime64[D]").astype("int64"),
+                         "e": teams.fillna("").astype(str).str.strip().to_numpy(dtype=object),
+                         "c": np.round(np.asarray(odds, dtype="float64"), 4)})
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+def _validate_chunk(chunk, columns):
+    # Renvoie (lignes valides au format du journal, dates, cotes) ; les autres sont rejetées
+    chunk = chunk.fillna("")
+    text = {c: chunk[c].astype(str).str.strip() if c in chunk.columns else pd.Series("", index=chunk.index) for c in columns}
+    dates = store.to_dates(text["Date"])
+    odds = pd.to_numeric(text["Cote"].str.replace(",", ".", regex=False), errors="coerce")
+    ok = dates.notna() & (odds > 1) & (text["Equipe"] != "")
+    if "Resultat" in columns:
+        plain = {_plain(r): r for r in RESULTS}
+        plain[""] = "En attente"
+        text["Resultat"] = text["Resultat"].map({r: plain.get(_plain(r)) for r in text["Resultat"].unique()})
+        ok &= text["Resultat"].notna()
+    if "Type_Over" in columns:
+        # Même correction que la page Overs si le + a sauté
+        text["Type_Over"] = text["Type_Over"].replace({"1.5": "+1.5", "2.5": "+2.5"})
+        ok &= text["Type_Over"].isin(OVER_TYPES)
+
+    ok = ok.to_numpy()
+    out = pd.DataFrame({c: text[c][ok] for c in columns})
+    out["Date"] = dates[ok].dt.strftime("%Y-%m-%d")
+    out["Cote"] = odds[ok].astype(float)
+    return out, dates[ok], odds[ok]
+
+def import_bets(file_path, source, columns, chunksize=IMPORT_CHUNK_ROWS):
+    # source = chemin ou fichier (CSV, liste collée) ; columns = colonnes de la stratégie (cf. pages)
+    # Renvoie {"read", "added", "duplicates", "invalid"} ; ValueError si le fichier est inexploitable
+    report = {"read": 0, "added": 0, "duplicates": 0, "invalid": 0}
+
+    def chunks(reader):
+        existing = clean_and_read_csv(file_path)
+        known = np.sort(_bet_keys(existing["Date"], existing["Equipe"], odds_vector(existing["Cote"]))) if len(existing) else np.array([], dtype="uint64")
+        imported = np.array([], dtype="uint64")
+        for chunk in reader:
+            rows, dates, odds = _validate_chunk(chunk, columns)
+            keys = _bet_keys(dates, rows["Equipe"], odds)
+            dup = np.isin(keys, known) | np.isin(keys, imported) | pd.Series(keys).duplicated().to_numpy()
+            imported = np.union1d(imported, keys[~dup])
+            report["read"] += len(chunk)
+            report["invalid"] += len(chunk) - len(rows)
+            report["duplicates"] += int(dup.sum())
+            yield rows[~dup]
+
+    try:
+        reader = _import_reader(source, columns, chunksize)
+        # Lecture de l'existant et ajout sous le même verrou : pas de doublon avec une écriture concurrente
+        _write(file_path, lambda: report.update(added=store.append_rows(file_path, chunks(reader))))
+    except (pd.errors.ParserError, UnicodeDecodeError) as e:
+        raise ValueError(f"Fichier illisible : {e}") from e
+    return report
+
+def export_bets(file_path, out, start=None, end=None, sub_types=None, columns=(), chunksize=EXPORT_CHUNK_ROWS):
+    # Vue filtrée d'une page (ordre d'affichage, gain et cumul de la fenêtre) écrite en CSV dans out,
+    # tranche par tranche : la mémoire dépend de chunksize, pas du nombre de paris. Renvoie le nb de lignes.
+    count = 0
+    for df in bankroll_index.chunks(file_path, start, end, sub_types, columns, chunksize):
+        if "Type_Over" in df.columns: df["Type_Over"] = sub_type(df).replace("nan", "")
+        df[["Gain_Unit", "Total_Bankroll"]] = df[["Gain_Unit", "Total_Bankroll"]].round(9)
+        df = df[[*columns, "Gain_Unit", "Total_Bankroll"]] if columns else df.drop(columns=["Original_Idx"])
+        df.to_csv(out, index=False, header=count == 0, date_format="%Y-%m-%d")
+        count += len(df)
+    return count
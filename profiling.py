@@ -0,0 +1,119 @@
+import contextlib
+import datetime
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# ==============================================================================
+# PROFILAGE DES PAGES (sans Streamlit)
+# ==============================================================================
+# Une "exécution" = un rerun de page : durée de chaque étape (with stage("...")), étapes imbriquées
+# notées "parent/enfant", et compteurs (lectures de fichiers, octets lus, cache...). Rien n'est mesuré
+# hors d'une exécution ouverte par begin() : stage() et count() ne font alors qu'un test.
+# Les exécutions terminées sont gardées dans l'historique passé à end(), un par session (new_history(),
+# HISTORY_MAX derniers reruns), exportable en JSON lines ; BANKROLL_PROFILE_LOG=fichier.jsonl les
+# ajoute en plus au fil de l'eau, toutes sessions confondues.
+
+ENABLED = os.environ.get("BANKROLL_PROFILE", "") not in ("", "0")  # valeur par défaut du panneau
+LOG_PATH = os.environ.get("BANKROLL_PROFILE_LOG")
+HISTORY_MAX = 200
+
+_local = threading.local()
+_noop = contextlib.nullcontext()
+
+
+class Run:
+    def __init__(self, page):
+        self.page = page
+        self.started = time.perf_counter()
+        self.ts = datetime.datetime.now().isoformat(timespec="seconds")
+        self.stages = {}    # "parent/enfant" -> [ms, nb d'appels]
+        self.counters = {}
+        self.total_ms = None
+        self._lock = threading.Lock()
+
+    def add_stage(self, path, ms):
+        with self._lock:
+            entry = self.stages.setdefault(path, [0.0, 0])
+            entry[0] += ms
+            entry[1] += 1
+
+    def count(self, name, n):
+        with self._lock: self.counters[name] = self.counters.get(name, 0) + n
+
+    def record(self):
+        return {"ts": self.ts, "page": self.page, "total_ms": round(self.total_ms, 3),
+                "stages": {k: {"ms": round(ms, 3), "n": n} for k, (ms, n) in self.stages.items()},
+                "counters": dict(self.counters)}
+
+
+class _Stage:
+    def __init__(self, run, name):
+        self.run = run
+        self.name = name
+
+    def __enter__(self):
+        self.parent = getattr(_local, "path", "")
+        self.path = f"{self.parent}/{self.name}" if self.parent else self.name
+        _local.path = self.path
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.run.add_stage(self.path, (time.perf_counter() - self.started) * 1000)
+        _local.path = self.parent
+
+
+def begin(page):
+    run = Run(page)
+    _local.run, _local.path = run, ""
+    return run
+
+def new_history():
+    return deque(maxlen=HISTORY_MAX)
+
+def end(run, history=None):
+    if run is None: return None
+    run.total_ms = (time.perf_counter() - run.started) * 1000
+    _local.run, _local.path = None, ""
+    rec = run.record()
+    if history is not None: history.append(rec)
+    if LOG_PATH:
+        with open(LOG_PATH, "a", encoding="utf-8") as f: f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    return rec
+
+def active():
+    return getattr(_local, "run", None) is not None
+
+def stage(name):
+    run = getattr(_local, "run", None)
+    return _noop if run is None else _Stage(run, name)
+
+def count(name, n=1):
+    run = getattr(_local, "run", None)
+    if run is not None: run.count(name, n)
+
+def bind(fn):
+    # Pour un pool de threads : les étapes et compteurs de fn restent rattachés à l'exécution en cours
+    run, path = getattr(_local, "run", None), getattr(_local, "path", "")
+    if run is None: return fn
+
+    def wrapper(*args, **kwargs):
+        previous = getattr(_local, "run", None), getattr(_local, "path", "")
+        _local.run, _local.path = run, path
+        try: return fn(*args, **kwargs)
+        finally: _local.run, _local.path = previous
+    return wrapper
+
+def to_jsonl(records):
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+
+def timed(fn):
+    # Décorateur : toute la fonction = une étape portant son nom (ex: page_overs)
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with stage(fn.__name__): return fn(*args, **kwargs)
+    return wrapper
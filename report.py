@@ -0,0 +1,138 @@
+import argparse
+import datetime
+
+import pandas as pd
+
+import data
+from bankroll import (PREFIX_COLS, gain_vector, merge_rollups, monthly_gains, odds_vector, recap_pivot, rollup, rollup_rows,
+                      sub_type, window_kpis)
+from strategies import LISTING_COLUMNS, OVERS, RECAP_STRATEGIES, STRATEGIES
+
+# ==============================================================================
+# RAPPORTS EN FLUX (sans Streamlit)
+# ==============================================================================
+# Mêmes calculs que les pages (fonctions de bankroll.py, nettoyage de data._clean), faits en une passe
+# sur les stratégies lues par tranches (store.read_chunks) : en mémoire, une tranche + les agrégats
+# (mois x sous-type, sommes) ou les seuls paris retenus, quelle que soit la taille de l'historique.
+
+CHUNK_ROWS = 50_000
+
+def monthly_table(file_path, chunksize=CHUNK_ROWS):
+    # Même table que data.monthly_rollups.table ; renvoie (table ou None si vide, colonne Type_Over présente)
+    table, has_sub_type = None, False
+    for chunk in data.iter_clean(file_path, chunksize):
+        if chunk.empty: continue
+        has_sub_type |= "Type_Over" in chunk.columns
+        part = rollup(rollup_rows(chunk))
+        table = part if table is None else merge_rollups(table, part)
+    return table, has_sub_type
+
+def recap(strategies=RECAP_STRATEGIES, sub_types=None, chunksize=CHUNK_ROWS):
+    # Même pivot que page_recap ; sub_types = {nom affiché: sous-types retenus}
+    sub_types = sub_types or {}
+    gains = {}
+    for name, file_path in strategies.items():
+        table, has_sub_type = monthly_table(file_path, chunksize)
+        if table is None: continue
+        gains[name] = monthly_gains(table, sub_types.get(name) if has_sub_type else None)
+    return recap_pivot(gains)
+
+def _between(chunk, start, end):
+    return (chunk["Date"] >= pd.Timestamp(start)) & (chunk["Date"] <= pd.Timestamp(end))
+
+def kpis(file_path, start, end, sub_types=None, chunksize=CHUNK_ROWS):
+    # Bénéfice, Nb, Cote Moy., Réussite d'une stratégie sur [start, end] (cf. bankroll_index.kpis)
+    total = dict.fromkeys(PREFIX_COLS, 0)
+    for chunk in data.iter_clean(file_path, chunksize):
+        if chunk.empty: continue
+        mask = _between(chunk, start, end)
+        if sub_types: mask &= sub_type(chunk).isin(sub_types)
+        rows = chunk[mask]
+        resultat = rows["Resultat"] if "Resultat" in rows.columns else pd.Series("En attente", index=rows.index)
+        cote = rows["Cote"] if "Cote" in rows.columns else pd.Series(0.0, index=rows.index)
+        total["Gain_Unit"] += gain_vector(resultat, cote).sum()
+        total["Nb"] += len(rows)
+        total["Gagnes"] += int((resultat == "Gagné").sum())
+        total["Cotes"] += odds_vector(cote).sum()
+    return window_kpis([total])
+
+def bets_between(strategies, start, end, pending_only=False, chunksize=CHUNK_ROWS):
+    # Paris de [start, end] avec la colonne "Stratégie", dans l'ordre de data.date_index.between
+    parts = []
+    for name, file_path in strategies.items():
+        kept = []
+        for chunk in data.iter_clean(file_path, chunksize):
+            if chunk.empty: continue
+            mask = _between(chunk, start, end)
+            if pending_only and "Resultat" in chunk.columns: mask &= chunk["Resultat"] == "En attente"
+            if mask.any(): kept.append(chunk[mask])
+        if not kept: continue
+        # Fichier du plus récent au plus ancien : tri stable par date = (date, plus récent d'abord)
+        rows = pd.concat(kept).sort_values("Date", kind="stable")
+        rows.insert(0, "Stratégie", name)
+        parts.append(rows)
+    if not parts: return pd.DataFrame()
+    return pd.concat(parts, ignore_index=True)
+
+def bets_on(strategies, day, chunksize=CHUNK_ROWS):
+    return bets_between(strategies, day, day, chunksize=chunksize)
+
+def pending(strategies, days, from_date=None, chunksize=CHUNK_ROWS):
+    # Paris "En attente" des N prochains jours (aujourd'hui compris)
+    start = pd.Timestamp(from_date or datetime.date.today()).normalize()
+    out = bets_between(strategies, start, start + pd.Timedelta(days=days - 1), pending_only=True, chunksize=chunksize)
+    return out.sort_values("Date", kind="stable", ignore_index=True) if not out.empty else out
+
+
+# ==============================================================================
+# LIGNE DE COMMANDE
+# python report.py recap [--type +1.5] | kpis [--start ... --end ... --type ...] | day [AAAA-MM-JJ] | pending [--days 7]
+# ==============================================================================
+
+def _date(text):
+    return datetime.date.fromisoformat(text)
+
+def _show(df, as_csv, index=False):
+    if df is None or df.empty: print("Aucune donnée.")
+    elif as_csv: print(df.to_csv(index=index), end="")
+    else: print(df.to_string(index=index))
+
+def _listing(df, with_date):
+    if df.empty: return df
+    df["Date"] = df["Date"].dt.date
+    return df[(["Date"] if with_date else []) + [c for c in LISTING_COLUMNS if c in df.columns]]
+
+
+if __name__ == "__main__":
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--chunksize", type=int, default=CHUNK_ROWS, help="lignes lues par tranche")
+    common.add_argument("--csv", action="store_true", help="sortie CSV (valeurs brutes)")
+    parser = argparse.ArgumentParser(description="Rapports sur les stratégies, sans Streamlit (lecture en flux, mémoire constante)")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_recap = sub.add_parser("recap", parents=[common], help="récapitulatif mensuel global")
+    p_recap.add_argument("--type", nargs="*", default=[], choices=["+1.5", "+2.5"], help="filtre des Paris Overs")
+    p_kpis = sub.add_parser("kpis", parents=[common], help="Bénéfice / Nb / Cote Moy. / Réussite par stratégie")
+    p_kpis.add_argument("--start", type=_date, default=datetime.date(2023, 1, 1))
+    p_kpis.add_argument("--end", type=_date, default=datetime.date.today() + datetime.timedelta(days=365))
+    p_kpis.add_argument("--type", nargs="*", default=[], choices=["+1.5", "+2.5"], help="filtre des Paris Overs")
+    p_day = sub.add_parser("day", parents=[common], help="paris d'une date, toutes stratégies")
+    p_day.add_argument("date", nargs="?", type=_date, default=datetime.date.today())
+    p_pending = sub.add_parser("pending", parents=[common], help="paris en attente des prochains jours")
+    p_pending.add_argument("--days", type=int, default=7)
+    args = parser.parse_args()
+
+    if args.cmd == "recap":
+        pivot = recap(RECAP_STRATEGIES, {OVERS: args.type}, args.chunksize)
+        if pivot is not None and not args.csv: pivot = pivot.map(lambda v: f"{v:+.2f} u")
+        _show(pivot, args.csv, index=True)
+    elif args.cmd == "kpis":
+        rows = []
+        for name, file_path in STRATEGIES.items():
+            k = kpis(file_path, args.start, args.end, args.type if name == OVERS else None, args.chunksize)
+            if args.csv: rows.append({"Stratégie": name, "Bénéfice": k["gain"], "Nb": k["nb"], "Cote Moy.": k["avg_odds"], "Réussite": k["win_rate"]})
+            else: rows.append({"Stratégie": name, "Bénéfice": f"{k['gain']:+.2f} u", "Nb": k["nb"], "Cote Moy.": f"{k['avg_odds']:.2f}", "Réussite": f"{k['win_rate']:.1f} %"})
+        _show(pd.DataFrame(rows), args.csv)
+    elif args.cmd == "day":
+        _show(_listing(bets_on(STRATEGIES, args.date, args.chunksize), with_date=False), args.csv)
+    else:
+        _show(_listing(pending(STRATEGIES, args.days, chunksize=args.chunksize), with_date=True), args.csv)
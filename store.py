@@ -0,0 +1,1007 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import profiling
+
+try: import fcntl
+except ImportError: fcntl = None  # Windows : verrou limité au processus courant
+
+# ==============================================================================
+# STOCKAGE DES STRATÉGIES
+# ==============================================================================
+# L'application désigne toujours une stratégie par son nom de fichier CSV ("paris_overs.csv"),
+# le backend choisi (variable d'environnement BANKROLL_BACKEND) décide où sont vraiment les données :
+#   csv     -> paris_overs.csv + journal        (par défaut, format historique)
+#   parquet -> paris_overs.parquet + journal    (colonnes typées, pré-filtre des dates en colonnes)
+#   sqlite  -> table "bets" de bankroll.db      (indexée sur (strategy, Date))
+#
+# Tous les backends renvoient le même "raw frame" : index 0..n-1 du plus récent au plus ancien
+# (= Original_Idx dans les pages), et chaque ligne a un numéro stable seq = n-1-position.
+
+BACKEND = os.environ.get("BANKROLL_BACKEND", "csv")
+SQLITE_PATH = os.environ.get("BANKROLL_DB", "bankroll.db")
+
+JOURNAL_SUFFIX = ".journal"
+ORPHAN_SUFFIX = ".orphan"
+JOURNAL_MAX_OPS = 200
+CHUNK_ROWS = 50_000  # lectures / écritures en flux (rapports, imports en masse)
+LOCK_SUFFIX = ".lock"
+
+# Schéma normalisé : Date en AAAA-MM-JJ, Cote numérique ; colonnes à peu de valeurs distinctes
+# chargées en catégories (cf. data._clean)
+CATEGORY_COLUMNS = ["Resultat", "Type_Over", "Infos", "Type_Pari"]
+
+_locks = {}
+_locks_guard = threading.Lock()
+_pending_compactions = set()
+
+
+class StaleVersionError(Exception):
+    # Écriture refusée : la stratégie a changé depuis la lecture des données modifiées
+    pass
+
+
+class JournalMismatchError(Exception):
+    # Journal écrit pour une autre version du fichier de base (nb de lignes différent) : mis de côté en .orphan
+    pass
+
+
+class _FileLock:
+    # Verrou d'écriture d'une stratégie : threads (RLock) + autres processus (flock sur <fichier>.lock).
+    # Réentrant ; les lectures ne le prennent jamais.
+    def __init__(self, path):
+        self.path = path + LOCK_SUFFIX
+        self._rlock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def __enter__(self):
+        self._rlock.acquire()
+        if self._depth == 0:
+            try:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl: fcntl.flock(fd, fcntl.LOCK_EX)
+                self._fd = fd
+            except BaseException:
+                self._rlock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl: fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._rlock.release()
+
+
+def _lock(file_path):
+    key = os.path.abspath(file_path)
+    with _locks_guard:
+        if key not in _locks: _locks[key] = _FileLock(key)
+        return _locks[key]
+
+
+def _replace(tmp, path):
+    # Fichier complet sur disque avant de prendre la place de l'ancien (jamais de version à moitié écrite)
+    with open(tmp, "rb") as f: os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _stat(file_path):
+    try: return os.stat(file_path)
+    except FileNotFoundError: return None
+
+
+def _fingerprint(stat):
+    if stat is None: return None
+    return [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+
+def _content_hash(f):
+    # Empreinte du contenu d'un fichier ouvert : inchangée par une copie, un touch, une restauration...
+    if f is None: return None
+    h = hashlib.blake2b(digest_size=16)
+    f.seek(0)
+    for block in iter(lambda: f.read(1 << 20), b""): h.update(block)
+    f.seek(0)
+    return h.hexdigest()
+
+
+def to_dates(series):
+    # Lecture des dates de clean_and_read_csv, sans remplacer les dates illisibles (NaT).
+    # Chemin rapide : AAAA-MM-JJ (avec ou sans heure) en une passe vectorisée ; seules les lignes
+    # restantes (anciennes saisies JJ/MM/AAAA...) passent par l'analyse format par format.
+    if pd.api.types.is_datetime64_any_dtype(series): return series.dt.normalize()
+    if isinstance(series.dtype, pd.CategoricalDtype): series = series.astype(object)
+    dates = pd.to_datetime(series, format="ISO8601", errors="coerce")
+    legacy = dates.isna() & series.notna() & (series.astype(str).str.strip() != "")
+    if legacy.any():
+        text = series[legacy].astype(str).str.split(" ").str[0]
+        dates = dates.astype("datetime64[ns]")
+        dates[legacy] = pd.to_datetime(text, dayfirst=True, format='mixed', errors='coerce').astype("datetime64[ns]")
+    return dates.dt.normalize()
+
+
+def _filter_dates(df, start, end):
+    if (start is None and end is None) or df.empty or "Date" not in df.columns: return df
+    # Une date illisible est affichée à la date du jour par clean_and_read_csv
+    dates = to_dates(df["Date"]).fillna(pd.Timestamp.today().normalize())
+    mask = pd.Series(True, index=df.index)
+    if start is not None: mask &= dates >= pd.Timestamp(start)
+    if end is not None: mask &= dates <= pd.Timestamp(end)
+    return df[mask]
+
+
+def set_cells(df, col, labels, values):
+    if col not in df.columns: df[col] = None
+    try: df.loc[labels, col] = values
+    except (TypeError, ValueError):
+        # ex: "+1.5" dans une colonne lue en float -> on passe la colonne en object
+        df[col] = df[col].astype(object)
+        df.loc[labels, col] = values
+
+
+def normalize_schema(df):
+    # Schéma normalisé (formats binaires, réécritures CSV) : Date en datetime, Cote en float, le reste en texte
+    df = df.copy()
+    for col in df.columns:
+        if col == "Date": df[col] = to_dates(df[col])
+        elif col == "Cote": df[col] = pd.to_numeric(df[col], errors="coerce")
+        else: df[col] = df[col].astype(object).map(lambda v: None if pd.isna(v) else str(v))
+    return df
+
+
+# ==============================================================================
+# BACKENDS "FICHIER DE BASE + JOURNAL" (CSV, PARQUET)
+# ==============================================================================
+# Le journal "x.csv.journal" (JSON lines) : 1re ligne = en-tête qui identifie le fichier de base auquel
+# il s'applique (nb de lignes, empreinte du contenu, et fp = inode/taille/mtime pour le cas courant sans
+# relecture), lignes suivantes = opérations :
+#   {"op": "add", "row": {...}}             -> nouveau pari
+#   {"op": "set", "seq": 12, "row": {...}}  -> modification de cellules d'une ligne existante
+# Un ajout ou une modification = une ligne ajoutée au journal (O(1)), la fusion dans le fichier
+# de base (compaction) se fait en tâche de fond quand le journal devient trop long, ou à la demande.
+# Fichier de base copié, touché, restauré ou modifié à côté : tant que son nombre de lignes n'a pas
+# changé, le journal s'y applique toujours (et l'en-tête est recalé à la prochaine écriture) ; sinon
+# le journal est mis de côté (x.csv.journal.<date>.orphan) et JournalMismatchError est levée.
+# Un journal non vide n'est jamais écrasé.
+# Version (contrôle optimiste des écritures, caches) = compteur logique : écritures déjà fusionnées dans
+# le fichier de base (en-tête "writes") + lignes d'opérations du journal. La compaction le conserve.
+
+class JournalBackend:
+    name = None
+    typed = False  # fichier de base à colonnes typées : les dates du journal sont converties à la lecture
+
+    def base_path(self, file_path):
+        return file_path
+
+    def journal_path(self, file_path):
+        return self.base_path(file_path) + JOURNAL_SUFFIX
+
+    # --- à fournir par chaque format ---
+    def _read_base(self, f, start, end, seqs):
+        # Renvoie (lignes indexées par seq, du plus récent au plus ancien ; nb total de lignes du fichier)
+        raise NotImplementedError
+
+    def _write_file(self, path, df):
+        raise NotImplementedError
+
+    def _write_chunks(self, path, frames, columns, total):
+        # Nouveau fichier de base écrit tranche par tranche (plus récent en premier, total lignes en tout)
+        raise NotImplementedError
+
+    def _count_base_rows(self, f):
+        raise NotImplementedError
+
+    def _base_columns(self, f):
+        raise NotImplementedError
+
+    def _iter_base(self, f, chunksize):
+        # Tranches du fichier de base dans l'ordre du fichier (plus récent en premier), index = n° de ligne
+        raise NotImplementedError
+
+    # --- journal ---
+    def _journal_state(self, file_path, f):
+        # f = fichier de base ouvert (None si absent). Renvoie (état, en-tête, opérations) :
+        #   "absent"  -> pas de journal (ou vide)
+        #   "ok"      -> journal écrit pour ce fichier de base
+        #   "moved"   -> même contenu, autre fichier (copie, touch, restauration)
+        #   "edited"  -> contenu modifié à côté, même nb de lignes : les opérations s'appliquent toujours
+        #   "orphan"  -> en-tête illisible ou nb de lignes différent
+        try:
+            with open(self.journal_path(file_path), encoding="utf-8") as j:
+                lines = j.read().splitlines()
+        except FileNotFoundError:
+            return "absent", None, None
+        if not lines: return "absent", None, None
+        try: header = json.loads(lines[0])
+        except ValueError: header = None
+        if not isinstance(header, dict) or header.get("op") != "base": return "orphan", None, None
+
+        ops = []
+        for line in lines[1:]:
+            try: ops.append(json.loads(line))
+            except ValueError: continue  # ligne tronquée (crash pendant l'écriture)
+        if header.get("fp") == (_fingerprint(os.fstat(f.fileno())) if f else None): return "ok", header, ops
+        if header.get("hash") is not None and header["hash"] == _content_hash(f): return "moved", header, ops
+        if header.get("rows") == self._count_base_rows(f): return "edited", header, ops
+        return "orphan", header, ops
+
+    def _write_journal(self, file_path, header, ops):
+        tmp = self.journal_path(file_path) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps(line, ensure_ascii=False, default=str) + "\n" for line in [header] + ops))
+        _replace(tmp, self.journal_path(file_path))
+        return header
+
+    def _base_header(self, f, base_rows):
+        return {"op": "base", "fp": _fingerprint(os.fstat(f.fileno())) if f else None, "hash": _content_hash(f), "rows": base_rows}
+
+    def _open_base(self, file_path):
+        try: return open(self.base_path(file_path), "rb")
+        except FileNotFoundError: return None
+
+    def _journal_lines(self, file_path):
+        try:
+            with open(self.journal_path(file_path), "rb") as j: return [line for line in j.read().splitlines() if line.strip()]
+        except FileNotFoundError: return []
+
+    def _writes(self, lines):
+        # Compteur logique d'un journal (cf. version)
+        try: header = json.loads(lines[0])
+        except ValueError: header = None
+        if not isinstance(header, dict): return 0, None
+        return header.get("writes", 0) + len(lines) - 1, header
+
+    def _new_journal(self, file_path, base_rows, writes=0):
+        f = self._open_base(file_path)
+        try: return self._write_journal(file_path, dict(self._base_header(f, base_rows), writes=writes), [])
+        finally:
+            if f: f.close()
+
+    def _ensure_journal(self, file_path):
+        # Renvoie (en-tête, opérations) du journal courant, en le créant ou le recalant si besoin (sous verrou)
+        f = self._open_base(file_path)
+        try:
+            state, header, ops = self._journal_state(file_path, f)
+            if state == "ok": return header, ops
+            if state == "absent":
+                # Fichier jamais journalisé : on compte ses lignes une fois pour cette version
+                return self._write_journal(file_path, dict(self._base_header(f, self._count_base_rows(f)), writes=0), []), []
+            if state == "orphan":
+                journal = self.journal_path(file_path)
+                orphan = f"{journal}.{time.strftime('%Y%m%d-%H%M%S')}{ORPHAN_SUFFIX}"
+                os.replace(journal, orphan)
+                raise JournalMismatchError(f"{file_path} : le fichier de base a changé de nombre de lignes depuis "
+                                           f"l'écriture du journal, opérations non appliquées mises de côté dans {orphan}")
+            # Copie / touch / modification à côté : l'en-tête suit le nouveau fichier, les opérations sont gardées
+            # (contenu modifié à côté = une écriture de plus pour la version)
+            header = dict(header, **self._base_header(f, header["rows"]))
+            if state == "edited": header["writes"] = header.get("writes", 0) + 1
+            return self._write_journal(file_path, header, ops), ops
+        finally:
+            if f: f.close()
+
+    def _append_ops(self, file_path, ops):
+        with _lock(file_path):
+            _, done = self._ensure_journal(file_path)
+            payload = "".join(json.dumps(op, ensure_ascii=False, default=str) + "\n" for op in ops)
+            with open(self.journal_path(file_path), "a+b") as f:
+                # Ligne précédente tronquée : on repart sur une ligne propre
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n": payload = "\n" + payload
+                f.write(payload.encode("utf-8"))
+        if len(done) + len(ops) >= JOURNAL_MAX_OPS: compact_in_background(file_path)
+
+    # --- API commune ---
+    def exists(self, file_path):
+        return os.path.exists(self.base_path(file_path)) or os.path.exists(self.journal_path(file_path))
+
+    def size(self, file_path):
+        # Octets lus par read() (fichier de base + journal)
+        return sum(stat.st_size for stat in (_stat(self.base_path(file_path)), _stat(self.journal_path(file_path))) if stat)
+
+    def _logical_version(self, file_path):
+        # None si l'en-tête ne correspond plus au fichier de base (remplacé à côté, ou compaction en cours)
+        stat = _stat(self.base_path(file_path))
+        lines = self._journal_lines(file_path)
+        if not lines: return ("base", _fingerprint(stat))  # jamais journalisé
+        writes, header = self._writes(lines)
+        if header is None or header.get("fp") != _fingerprint(stat): return None
+        return writes
+
+    def version(self, file_path):
+        # Compteur logique : change à chaque ajout / modification / réécriture, pas à la compaction
+        token = self._logical_version(file_path)
+        if token is not None: return token
+        with _lock(file_path):
+            self._ensure_journal(file_path)  # en-tête recalé sur le fichier de base (ou journal mis de côté)
+            return self._logical_version(file_path)
+
+    def read(self, file_path, start=None, end=None):
+        base = self.base_path(file_path)
+        for _ in range(5):
+            try:
+                with open(base, "rb") as f:
+                    stat = os.fstat(f.fileno())
+                    state, _, ops = self._journal_state(file_path, f)
+                    if state != "orphan":
+                        seqs = {op["seq"] for op in ops or [] if op.get("op") == "set"}
+                        df_base, base_rows = self._read_base(f, start, end, seqs)
+            except FileNotFoundError:
+                stat, df_base, base_rows = None, pd.DataFrame(), 0
+                state, _, ops = self._journal_state(file_path, None)
+            if state == "orphan":
+                with _lock(file_path): self._ensure_journal(file_path)  # met le journal de côté et lève l'erreur
+                continue
+            # Si le fichier a été remplacé (compaction) pendant la lecture, on recommence
+            if _fingerprint(_stat(base)) == _fingerprint(stat): break
+
+        ops = ops or []
+        adds = [op["row"] for op in ops if op.get("op") == "add"]
+        n = base_rows + len(adds)
+        df = df_base
+        if adds:
+            # Le plus récent en premier, comme l'ancien pd.concat([new_row, df_old])
+            df_adds = pd.DataFrame(adds[::-1], index=range(n - 1, base_rows - 1, -1))
+            if self.typed and "Date" in df_adds.columns: df_adds["Date"] = to_dates(df_adds["Date"])
+            if df_base.empty and len(df_base.columns) == 0: df = df_adds
+            else: df = pd.concat([df_adds, df_base])
+
+        # Modifications regroupées par colonne (la dernière écriture d'une cellule gagne)
+        cells = {}
+        for op in ops:
+            if op.get("op") != "set" or op["seq"] not in df.index: continue
+            for col, val in op["row"].items(): cells.setdefault(col, {})[op["seq"]] = val
+        if cells and df is df_base: df = df.copy()
+        for col, by_seq in cells.items():
+            values = list(by_seq.values())
+            if self.typed and col == "Date": values = list(to_dates(pd.Series(values, dtype=object)))
+            set_cells(df, col, list(by_seq.keys()), values)
+
+        df = _filter_dates(df, start, end)
+        # seq -> position affichée (0 = plus récent)
+        df.index = pd.Index(n - 1 - df.index.to_numpy(dtype="int64"))
+        if start is None and end is None: df.index = pd.RangeIndex(len(df))
+        return df
+
+    def read_chunks(self, file_path, chunksize):
+        # Même contenu que read() (sans plage de dates), par tranches : le journal (borné par la compaction)
+        # est chargé une fois, le fichier de base est parcouru tranche par tranche
+        f = self._open_base(file_path)
+        try:
+            state, header, ops = self._journal_state(file_path, f)
+            if state == "orphan":
+                with _lock(file_path): self._ensure_journal(file_path)  # met le journal de côté et lève l'erreur
+                state, header, ops = self._journal_state(file_path, f)
+            ops = ops or []
+            adds = [op["row"] for op in ops if op.get("op") == "add"]
+            base_rows = header["rows"] if header else 0
+            cells = {}
+            for op in ops:
+                if op.get("op") == "set":
+                    for col, val in op["row"].items(): cells.setdefault(col, {})[op["seq"]] = val
+            # Colonnes dans l'ordre de read() : ajouts, puis fichier de base, puis colonnes créées par modification
+            columns = list(dict.fromkeys([c for row in adds[::-1] for c in row] + (self._base_columns(f) if f else []) + list(cells)))
+
+            def finish(df, seqs, first):
+                df.index = pd.Index(seqs)
+                for col, by_seq in cells.items():
+                    hit = [seq for seq in by_seq if seq in df.index]
+                    if not hit: continue
+                    values = [by_seq[seq] for seq in hit]
+                    if self.typed and col == "Date": values = list(to_dates(pd.Series(values, dtype=object)))
+                    set_cells(df, col, hit, values)
+                df = df.reindex(columns=columns)
+                df.index = pd.RangeIndex(first, first + len(df))  # position affichée (0 = plus récent)
+                return df
+
+            if adds:
+                df_adds = pd.DataFrame(adds[::-1])
+                if self.typed and "Date" in df_adds.columns: df_adds["Date"] = to_dates(df_adds["Date"])
+                yield finish(df_adds, np.arange(base_rows + len(adds) - 1, base_rows - 1, -1), 0)
+            if f is None: return
+            for df in self._iter_base(f, chunksize):
+                offsets = df.index.to_numpy(dtype="int64")
+                yield finish(df, base_rows - 1 - offsets, len(adds) + int(offsets[0]) if len(offsets) else len(adds))
+        finally:
+            if f: f.close()
+
+    def append_rows(self, file_path, rows):
+        self._append_ops(file_path, [{"op": "add", "row": row} for row in rows])
+
+    def append_chunks(self, file_path, chunks):
+        # Import en masse, tout ou rien, une tranche en mémoire à la fois : les tranches (listes de lignes ou
+        # DataFrames, mêmes colonnes que la 1re) sont d'abord écrites à part (un CSV temporaire chacune), puis
+        #   petit import -> recopiées à la suite du journal dans un nouveau journal, qui remplace l'ancien
+        #   gros import  -> fusionnées dans un nouveau fichier de base écrit en flux (pas de journal géant à relire)
+        journal = self.journal_path(file_path)
+        staged, count, columns = [], 0, None
+        with _lock(file_path):
+            try:
+                for rows in chunks:
+                    if not len(rows): continue
+                    frame = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
+                    if columns is None: columns = list(frame.columns)
+                    staged.append(f"{journal}.import{len(staged)}.tmp")
+                    frame.reindex(columns=columns).to_csv(staged[-1], index=False)
+                    count += len(frame)
+                if not count: return 0
+
+                _, done = self._ensure_journal(file_path)
+                if len(done) + count >= JOURNAL_MAX_OPS: self._merge_import(file_path, staged, columns, count)
+                else: self._journal_import(file_path, staged)
+                return count
+            finally:
+                for path in staged:
+                    if os.path.exists(path): os.remove(path)
+
+    @staticmethod
+    def _read_staged(path):
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        if "Cote" in df.columns: df["Cote"] = pd.to_numeric(df["Cote"], errors="coerce")
+        return df
+
+    def _journal_import(self, file_path, staged):
+        journal = self.journal_path(file_path)
+        tmp = journal + ".tmp"
+        with open(tmp, "w+b") as out:
+            with open(journal, "rb") as f: shutil.copyfileobj(f, out)
+            if out.tell():
+                out.seek(-1, os.SEEK_END)
+                if out.read(1) != b"\n": out.write(b"\n")
+            for path in staged:
+                rows = self._read_staged(path).to_dict("records")
+                out.write("".join(json.dumps({"op": "add", "row": row}, ensure_ascii=False, default=str) + "\n" for row in rows).encode("utf-8"))
+        _replace(tmp, journal)
+
+    def _merge_import(self, file_path, staged, columns, count):
+        # Nouveau fichier de base = import (du plus récent au plus ancien) puis l'historique, comme
+        # pd.concat([import, historique]) : tranches importées relues à l'envers, historique lu en flux
+        base = self.base_path(file_path)
+        lines = self._journal_lines(file_path)
+        writes = (self._writes(lines)[0] if lines else 0) + 1
+        total = count + self.row_count(file_path)
+        history = self.read_chunks(file_path, CHUNK_ROWS)
+        try:
+            first = next(history, None)
+            if first is not None: columns = list(dict.fromkeys(columns + list(first.columns)))
+
+            def frames():
+                for path in reversed(staged): yield self._read_staged(path).iloc[::-1]
+                if first is not None:
+                    yield first
+                    yield from history
+
+            tmp = base + ".tmp"
+            self._write_chunks(tmp, frames(), columns, total)
+        finally:
+            history.close()
+        _replace(tmp, base)
+        self._new_journal(file_path, total, writes)
+
+    def row_count(self, file_path):
+        with _lock(file_path):
+            header, ops = self._ensure_journal(file_path)
+        return header["rows"] + sum(1 for op in ops if op.get("op") == "add")
+
+    def patch_rows(self, file_path, changes, expected=None):
+        with _lock(file_path):
+            if expected is not None and self.version(file_path) != expected: raise StaleVersionError(file_path)
+            n = self.row_count(file_path)
+            ops = [{"op": "set", "seq": n - 1 - int(pos), "row": row} for pos, row in changes.items()]
+            self._append_ops(file_path, ops)
+
+    def write(self, file_path, df, merge=False):
+        # Réécriture complète : le journal est absorbé par le nouveau fichier.
+        # merge=True (compaction) : mêmes données, le compteur de version est conservé
+        base = self.base_path(file_path)
+        with _lock(file_path):
+            lines = self._journal_lines(file_path)
+            writes = (self._writes(lines)[0] if lines else 0) + (0 if merge else 1)
+            tmp = base + ".tmp"
+            self._write_file(tmp, df)
+            _replace(tmp, base)
+            self._new_journal(file_path, len(df), writes)
+
+    def compact(self, file_path):
+        with _lock(file_path):
+            f = self._open_base(file_path)
+            try: state, _, ops = self._journal_state(file_path, f)
+            finally:
+                if f: f.close()
+            if state == "orphan": self._ensure_journal(file_path)  # met le journal de côté et lève l'erreur
+            if not ops: return
+            self.write(file_path, self.read(file_path), merge=True)
+
+
+class CsvBackend(JournalBackend):
+    name = "csv"
+
+    def _read_base(self, f, start, end, seqs):
+        # Pas de lecture partielle possible en CSV : la plage de dates est filtrée après coup
+        try: df = pd.read_csv(f, dtype={c: "category" for c in CATEGORY_COLUMNS})
+        except pd.errors.EmptyDataError: df = pd.DataFrame()
+        df.index = pd.RangeIndex(len(df) - 1, -1, -1)
+        return df, len(df)
+
+    def _write_file(self, path, df):
+        # Réécriture (compaction, migration) au schéma normalisé : dates AAAA-MM-JJ pour le chemin rapide
+        self._write_chunks(path, [df], list(df.columns), len(df))
+
+    def _write_chunks(self, path, frames, columns, total):
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            header = True
+            for df in frames:
+                df = normalize_schema(df.reindex(columns=columns))
+                if "Date" in df.columns: df["Date"] = df["Date"].dt.strftime('%Y-%m-%d')
+                df.to_csv(f, index=False, header=header)
+                header = False
+            if header: pd.DataFrame(columns=columns).to_csv(f, index=False)
+
+    def _count_base_rows(self, f):
+        if f is None: return 0
+        try: return len(pd.read_csv(f, usecols=[0]))
+        except pd.errors.EmptyDataError: return 0
+        finally: f.seek(0)
+
+    def _base_columns(self, f):
+        try: return list(pd.read_csv(f, nrows=0).columns)
+        except pd.errors.EmptyDataError: return []
+        finally: f.seek(0)
+
+    def _iter_base(self, f, chunksize):
+        try:
+            yield from pd.read_csv(f, dtype={c: "category" for c in CATEGORY_COLUMNS}, chunksize=chunksize)
+        except pd.errors.EmptyDataError: return
+
+
+class ParquetBackend(JournalBackend):
+    name = "parquet"
+    typed = True
+
+    def base_path(self, file_path):
+        return os.path.splitext(file_path)[0] + ".parquet"
+
+    def _read_base(self, f, start, end, seqs):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(f)
+        table = pf.read()
+        if start is not None or end is not None:
+            # Pré-filtre sur la colonne Date typée, avant toute conversion en pandas ;
+            # les dates vides et les lignes modifiées dans le journal sont gardées
+            date = table.column("Date")
+            in_range = pc.and_(
+                pc.greater_equal(date, pa.scalar(pd.Timestamp(start or "1900-01-01"), date.type)),
+                pc.less_equal(date, pa.scalar(pd.Timestamp(end or "2999-12-31"), date.type)))
+            keep = pc.or_(pc.is_null(date), pc.fill_null(in_range, False))
+            if seqs: keep = pc.or_(keep, pc.is_in(table.column("_seq"), value_set=pa.array(sorted(seqs), pa.int64())))
+            table = table.filter(keep)
+        df = table.to_pandas()
+        df.index = pd.Index(df.pop("_seq").to_numpy(dtype="int64"))
+        return df, pf.metadata.num_rows
+
+    def _write_file(self, path, df):
+        df = normalize_schema(df)
+        df["_seq"] = range(len(df) - 1, -1, -1)
+        df.to_parquet(path, index=False)
+
+    def _write_chunks(self, path, frames, columns, total):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        # Schéma fixé d'avance (une colonne vide dans une tranche ne doit pas changer de type)
+        schema = pa.schema([(c, pa.timestamp("ns") if c == "Date" else pa.float64() if c == "Cote" else pa.string()) for c in columns]
+                           + [("_seq", pa.int64())])
+        seq = total
+        with pq.ParquetWriter(path, schema) as writer:
+            for df in frames:
+                df = normalize_schema(df.reindex(columns=columns))
+                df["_seq"] = range(seq - 1, seq - 1 - len(df), -1)
+                seq -= len(df)
+                writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+
+    def _count_base_rows(self, f):
+        import pyarrow.parquet as pq
+        if f is None: return 0
+        try: return pq.ParquetFile(f).metadata.num_rows
+        finally: f.seek(0)
+
+    def _base_columns(self, f):
+        import pyarrow.parquet as pq
+        return [c for c in pq.ParquetFile(f).schema_arrow.names if c != "_seq"]
+
+    def _iter_base(self, f, chunksize):
+        import pyarrow.parquet as pq
+        first = 0
+        for batch in pq.ParquetFile(f).iter_batches(batch_size=chunksize):
+            df = batch.to_pandas().drop(columns=["_seq"])
+            df.index = pd.RangeIndex(first, first + len(df))
+            first += len(df)
+            yield df
+
+
+# ==============================================================================
+# BACKEND SQLITE
+# ==============================================================================
+# Une seule table "bets" pour toutes les stratégies, clé (strategy, seq), index (strategy, Date).
+# Les colonnes propres à une stratégie (Type_Over, Infos...) sont ajoutées à la volée,
+# l'ordre des colonnes de chaque stratégie est gardé dans la table "strategies".
+
+class SqliteBackend:
+    name = "sqlite"
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or SQLITE_PATH
+        self._ready = False
+
+    def _connect(self):
+        con = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        if not self._ready:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("CREATE TABLE IF NOT EXISTS bets (strategy TEXT NOT NULL, seq INTEGER NOT NULL, Date TEXT, PRIMARY KEY (strategy, seq))")
+            con.execute("CREATE INDEX IF NOT EXISTS idx_bets_strategy_date ON bets (strategy, Date)")
+            con.execute("CREATE TABLE IF NOT EXISTS strategies (strategy TEXT PRIMARY KEY, columns TEXT NOT NULL, version INTEGER NOT NULL DEFAULT 0)")
+            if "version" not in {r[1] for r in con.execute("PRAGMA table_info(strategies)")}:
+                con.execute("ALTER TABLE strategies ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            self._ready = True
+        return con
+
+    def _transaction(self, strategy, fn):
+        con = self._connect()
+        try:
+            con.execute("BEGIN IMMEDIATE")
+            result = fn(con)
+            # Compteur d'écritures de la stratégie (sert de version pour les caches)
+            con.execute("UPDATE strategies SET version = version + 1 WHERE strategy = ?", (strategy,))
+            con.execute("COMMIT")
+            return result
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+        finally:
+            con.close()
+
+    @staticmethod
+    def strategy(file_path):
+        return os.path.splitext(os.path.basename(file_path))[0]
+
+    @staticmethod
+    def _quote(col):
+        return '"' + str(col).replace('"', '""') + '"'
+
+    def _columns(self, con, strategy):
+        row = con.execute("SELECT columns FROM strategies WHERE strategy = ?", (strategy,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _add_columns(self, con, strategy, names):
+        # Déclare les nouvelles colonnes (dans la table et dans l'ordre propre à la stratégie)
+        table_cols = {r[1] for r in con.execute("PRAGMA table_info(bets)")}
+        for col in names:
+            if col not in table_cols:
+                con.execute(f"ALTER TABLE bets ADD COLUMN {self._quote(col)}")
+                table_cols.add(col)
+        cols = self._columns(con, strategy) or []
+        cols += [c for c in names if c not in cols]
+        con.execute("INSERT INTO strategies (strategy, columns) VALUES (?, ?) ON CONFLICT (strategy) DO UPDATE SET columns = excluded.columns", (strategy, json.dumps(cols)))
+        return cols
+
+    @staticmethod
+    def _sql_value(col, val):
+        if val is None or (not isinstance(val, str) and pd.isna(val)): return None
+        if col == "Date":
+            if isinstance(val, str) and len(val) == 10 and val[4] == val[7] == "-": return val  # déjà en AAAA-MM-JJ
+            date = to_dates(pd.Series([val])).iloc[0]
+            return None if pd.isna(date) else date.strftime('%Y-%m-%d')
+        if hasattr(val, "item"): return val.item()
+        return val
+
+    @staticmethod
+    def _sql_dates(values):
+        # Colonne Date entière en AAAA-MM-JJ : une seule conversion pour les valeurs qui ne le sont pas déjà
+        values = list(values)
+        todo = [i for i, val in enumerate(values) if not (isinstance(val, str) and len(val) == 10 and val[4] == val[7] == "-")]
+        if todo:
+            dates = to_dates(pd.Series([values[i] for i in todo], dtype=object)).dt.strftime('%Y-%m-%d')
+            for i, date in zip(todo, dates): values[i] = None if pd.isna(date) else date
+        return values
+
+    def _insert(self, con, strategy, rows, first_seq):
+        cols = self._add_columns(con, strategy, list(dict.fromkeys(c for row in rows for c in row)))
+        sql = f"INSERT INTO bets (strategy, seq, {', '.join(self._quote(c) for c in cols)}) VALUES ({', '.join('?' * (len(cols) + 2))})"
+        dates = self._sql_dates(row.get("Date") for row in rows) if "Date" in cols else None
+        con.executemany(sql, [[strategy, first_seq + i] + [dates[i] if c == "Date" else self._sql_value(c, row.get(c)) for c in cols]
+                              for i, row in enumerate(rows)])
+
+    def _row_count(self, con, strategy):
+        # seq est contigu (0..n-1) : aucune suppression ligne à ligne
+        return con.execute("SELECT COALESCE(MAX(seq) + 1, 0) FROM bets WHERE strategy = ?", (strategy,)).fetchone()[0]
+
+    def exists(self, file_path):
+        con = self._connect()
+        try: return self._columns(con, self.strategy(file_path)) is not None
+        finally: con.close()
+
+    def size(self, file_path):
+        # Base partagée par toutes les stratégies : pas de taille par stratégie
+        return 0
+
+    def version(self, file_path):
+        con = self._connect()
+        try:
+            row = con.execute("SELECT version FROM strategies WHERE strategy = ?", (self.strategy(file_path),)).fetchone()
+            return row[0] if row else None
+        finally:
+            con.close()
+
+    def row_count(self, file_path):
+        con = self._connect()
+        try: return self._row_count(con, self.strategy(file_path))
+        finally: con.close()
+
+    def read(self, file_path, start=None, end=None):
+        strategy = self.strategy(file_path)
+        con = self._connect()
+        try:
+            cols = self._columns(con, strategy)
+            if cols is None: return pd.DataFrame()
+            where, params = "strategy = ?", [strategy]
+            if start is not None or end is not None:
+                # Recherche par l'index (strategy, Date) ; les dates illisibles (NULL) sont gardées
+                where += " AND (Date IS NULL OR Date BETWEEN ? AND ?)"
+                params += [pd.Timestamp(start or "1900-01-01").strftime('%Y-%m-%d'), pd.Timestamp(end or "2999-12-31").strftime('%Y-%m-%d')]
+            select = ", ".join(["seq"] + [self._quote(c) for c in cols])
+            con.execute("BEGIN")  # comptage et lecture sur le même instantané
+            n = self._row_count(con, strategy)
+            df = pd.read_sql_query(f"SELECT {select} FROM bets WHERE {where} ORDER BY seq DESC", con, params=params)
+            con.execute("COMMIT")
+        finally:
+            con.close()
+        df.index = pd.Index(n - 1 - df.pop("seq").to_numpy(dtype="int64"))
+        if start is None and end is None: df.index = pd.RangeIndex(len(df))
+        # Dates déjà normalisées en AAAA-MM-JJ à l'écriture
+        if "Date" in df.columns: df["Date"] = pd.to_datetime(df["Date"], format="%Y-%m-%d", errors="coerce")
+        return _filter_dates(df, start, end)
+
+    def read_chunks(self, file_path, chunksize):
+        strategy = self.strategy(file_path)
+        con = self._connect()
+        try:
+            cols = self._columns(con, strategy)
+            if cols is None: return
+            select = ", ".join(self._quote(c) for c in cols)
+            con.execute("BEGIN")  # toutes les tranches sur le même instantané
+            first = 0
+            for df in pd.read_sql_query(f"SELECT {select} FROM bets WHERE strategy = ? ORDER BY seq DESC", con, params=[strategy], chunksize=chunksize):
+                df.index = pd.RangeIndex(first, first + len(df))
+                first += len(df)
+                if "Date" in df.columns: df["Date"] = pd.to_datetime(df["Date"], format="%Y-%m-%d", errors="coerce")
+                yield df
+            con.execute("COMMIT")
+        finally:
+            con.close()
+
+    def append_rows(self, file_path, rows):
+        strategy = self.strategy(file_path)
+        self._transaction(strategy, lambda con: self._insert(con, strategy, rows, self._row_count(con, strategy)))
+
+    def append_chunks(self, file_path, chunks):
+        # Import en masse : une seule transaction, les tranches sont insérées au fil de l'eau
+        strategy = self.strategy(file_path)
+
+        def insert(con):
+            first_seq, count = self._row_count(con, strategy), 0
+            for rows in chunks:
+                if not len(rows): continue
+                if isinstance(rows, pd.DataFrame): rows = rows.to_dict("records")
+                self._insert(con, strategy, rows, first_seq + count)
+                count += len(rows)
+            return count
+        return self._transaction(strategy, insert)
+
+    def patch_rows(self, file_path, changes, expected=None):
+        strategy = self.strategy(file_path)
+
+        def apply(con):
+            # Contrôle de version dans la transaction (BEGIN IMMEDIATE : aucun autre écrivain entre-temps)
+            if expected is not None:
+                row = con.execute("SELECT version FROM strategies WHERE strategy = ?", (strategy,)).fetchone()
+                if (row[0] if row else None) != expected: raise StaleVersionError(file_path)
+            n = self._row_count(con, strategy)
+            self._add_columns(con, strategy, list(dict.fromkeys(c for row in changes.values() for c in row)))
+            for pos, row in changes.items():
+                sets = ", ".join(f"{self._quote(c)} = ?" for c in row)
+                values = [self._sql_value(c, v) for c, v in row.items()]
+                con.execute(f"UPDATE bets SET {sets} WHERE strategy = ? AND seq = ?", values + [strategy, n - 1 - int(pos)])
+        self._transaction(strategy, apply)
+
+    def write(self, file_path, df):
+        strategy = self.strategy(file_path)
+        rows = df.astype(object).where(df.notna(), None).to_dict("records")
+
+        def replace(con):
+            con.execute("DELETE FROM bets WHERE strategy = ?", (strategy,))
+            con.execute("UPDATE strategies SET columns = '[]' WHERE strategy = ?", (strategy,))
+            self._add_columns(con, strategy, [str(c) for c in df.columns])
+            # Frame du plus récent au plus ancien -> seq décroissant
+            self._insert(con, strategy, rows[::-1], 0)
+        self._transaction(strategy, replace)
+
+    def compact(self, file_path):
+        pass
+
+
+BACKENDS = {"csv": CsvBackend, "parquet": ParquetBackend, "sqlite": SqliteBackend}
+_instances = {}
+
+
+def get_backend(name=None):
+    name = name or BACKEND
+    if name not in BACKENDS: raise ValueError(f"Backend inconnu : {name} (choix : {', '.join(BACKENDS)})")
+    if name not in _instances: _instances[name] = BACKENDS[name]()
+    return _instances[name]
+
+
+# ==============================================================================
+# API UTILISÉE PAR L'APPLICATION
+# ==============================================================================
+
+def exists(file_path):
+    return get_backend().exists(file_path)
+
+
+def version(file_path):
+    # Jeton de version d'une stratégie : change à chaque écriture, même depuis un autre processus
+    return (BACKEND, get_backend().version(file_path))
+
+
+def read_raw(file_path, start=None, end=None):
+    # start / end : ne charger qu'une plage de dates (les index restent les positions globales)
+    backend = get_backend()
+    df = backend.read(file_path, start, end)
+    if profiling.active():
+        profiling.count("reads")
+        profiling.count("bytes_read", backend.size(file_path))
+        profiling.count("rows_read", len(df))
+    return df
+
+
+def read_chunks(file_path, chunksize=CHUNK_ROWS):
+    # Lecture en flux (rapports hors application) : mêmes lignes que read_raw, par tranches de chunksize
+    return get_backend().read_chunks(file_path, chunksize)
+
+
+def write_lock(file_path):
+    # Verrou d'écriture (threads + processus) d'une stratégie, quel que soit le backend
+    return _lock(file_path)
+
+
+def append_row(file_path, row):
+    with _lock(file_path): get_backend().append_rows(file_path, [row])
+
+
+def append_rows(file_path, chunks):
+    # Ajout en masse : chunks = itérable de listes de lignes (ou de DataFrames), consommé au fil de l'eau
+    # et validé en une seule écriture (journal / fichier remplacé, transaction) ; renvoie le nb de lignes ajoutées
+    with _lock(file_path): return get_backend().append_chunks(file_path, chunks)
+
+
+def row_count(file_path):
+    return get_backend().row_count(file_path)
+
+
+def patch_rows(file_path, changes, expected=None):
+    # changes = {position affichée (Original_Idx): {colonne: nouvelle valeur}}
+    # expected = jeton version() des données modifiées : StaleVersionError si la stratégie a changé depuis
+    if not changes: return
+    backend = get_backend()
+    if expected is not None and expected[0] != backend.name: raise StaleVersionError(file_path)
+    with _lock(file_path): backend.patch_rows(file_path, changes, None if expected is None else expected[1])
+
+
+def write_raw(file_path, df):
+    with _lock(file_path): get_backend().write(file_path, df)
+
+
+def compact(file_path):
+    with _lock(file_path): get_backend().compact(file_path)
+
+
+def compact_in_background(file_path):
+    with _locks_guard:
+        if file_path in _pending_compactions: return
+        _pending_compactions.add(file_path)
+
+    def run():
+        try: compact(file_path)
+        finally:
+            with _locks_guard: _pending_compactions.discard(file_path)
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def migrate(file_paths, src, dst):
+    # Copie complète de chaque stratégie d'un backend à l'autre (journal compris)
+    source, target = get_backend(src), get_backend(dst)
+    for path in file_paths:
+        if not source.exists(path): continue
+        df = source.read(path)
+        target.write(path, df)
+        yield path, len(df)
+
+
+# ==============================================================================
+# CHANGE-SET DE L'ÉDITEUR
+# ==============================================================================
+
+def _json_value(col, val, float32=False):
+    if val is None or pd.isna(val): return None
+    if col == "Date": return pd.Timestamp(val).strftime('%Y-%m-%d')
+    # Colonne float32 (Cote) : on écrit la valeur saisie (1.55), pas 1.5499999523. Décidé par le type de la
+    # colonne : une cellule modifiée dans l'éditeur ressort en float Python
+    if float32: return float(str(np.float32(val)))
+    if hasattr(val, "item"): return val.item()
+    return val
+
+
+def editor_changes(displayed, edited, cols):
+    # Compare l'éditeur à ce qui était affiché : {Original_Idx: {colonne modifiée: valeur}}
+    before = displayed.set_index("Original_Idx")
+    after = edited.set_index("Original_Idx").reindex(before.index)
+    changes = {}
+    for col in cols:
+        if col not in before.columns or col not in after.columns: continue
+        if col == "Date":
+            old, new = pd.to_datetime(before[col], errors="coerce"), pd.to_datetime(after[col], errors="coerce")
+        else:
+            old, new = before[col].astype(object), after[col].astype(object)
+        same = (old == new) | (old.isna() & new.isna())
+        float32 = "float32" in (str(before[col].dtype), str(after[col].dtype))
+        for idx, val in new[~same].items():
+            changes.setdefault(int(idx), {})[col] = _json_value(col, val, float32)
+    return changes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintenance des fichiers de stratégie")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_compact = sub.add_parser("compact", help="fusionne les journaux dans les fichiers de base")
+    p_compact.add_argument("files", nargs="*")
+    p_migrate = sub.add_parser("migrate", help="copie les stratégies d'un backend vers un autre")
+    p_migrate.add_argument("--from", dest="src", default="csv", choices=list(BACKENDS))
+    p_migrate.add_argument("--to", dest="dst", required=True, choices=list(BACKENDS))
+    p_migrate.add_argument("files", nargs="*")
+    p_normalize = sub.add_parser("normalize", help="réécrit les fichiers au schéma normalisé (dates AAAA-MM-JJ)")
+    p_normalize.add_argument("files", nargs="*")
+    args = parser.parse_args()
+
+    # Par défaut : tous les CSV de stratégie du dossier courant
+    files = args.files or sorted(glob.glob("*.csv"))
+    if args.cmd == "compact":
+        for path in files:
+            compact(path)
+            print(f"{path} : journal fusionné")
+    elif args.cmd == "normalize":
+        for path in files:
+            if not exists(path): continue
+            write_raw(path, read_raw(path))
+            print(f"{path} : schéma normalisé")
+    else:
+        for path, n in migrate(files, args.src, args.dst):
+            print(f"{path} : {n} lignes copiées de {args.src} vers {args.dst}")
@@ -0,0 +1,24 @@
+# ==============================================================================
+# STRATÉGIES (registre commun à l'application et aux rapports)
+# ==============================================================================
+# (noms des stratégies ; le format réel dépend de BANKROLL_BACKEND : csv / parquet / sqlite, cf. store.py)
+FILE_OVERS = "paris_overs.csv"
+FILE_STATS = "stats_max.csv"
+FILE_SECURE = "home_draw.csv"
+FILE_GOLD = "prono_or.csv"
+FILE_CIA_2E = "cia_2echec.csv"
+FILE_MOY_GLIS_2E = "moy_glissante_2e.csv"
+
+# Paris par Date
+STRATEGIES = {
+    "⚽ Paris Overs": FILE_OVERS,
+    "📊 Stats Max": FILE_STATS,
+    "🛡️ 1N & Plus": FILE_SECURE,
+    "🧠 CIA 2echec": FILE_CIA_2E,
+    "📈 MoyGlissante 2Echecs": FILE_MOY_GLIS_2E,
+    "🏆 Prono en Or": FILE_GOLD
+}
+# Récapitulatif Global (sans 1N & Plus)
+RECAP_STRATEGIES = {name: fp for name, fp in STRATEGIES.items() if fp != FILE_SECURE}
+OVERS = "⚽ Paris Overs"  # seule stratégie filtrable par Type_Over
+LISTING_COLUMNS = ["Stratégie", "Equipe", "Cote", "Resultat", "Type_Over", "Type_Pari", "Infos"]
@@ -0,0 +1,31 @@
+import glob
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import data  # noqa: E402
+import store  # noqa: E402
+from strategies import STRATEGIES  # noqa: E402
+
+
+def _reset():
+    data.frame_cache.clear()
+    for index in data._indexes: index._by_file.clear()
+
+
+@pytest.fixture
+def bundled(tmp_path, monkeypatch):
+    # Copie des stratégies fournies dans un dossier de travail temporaire (au format de BANKROLL_BACKEND),
+    # index et cache vides
+    for path in glob.glob(os.path.join(ROOT, "*.csv")): shutil.copy(path, tmp_path)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(store, "_instances", {})  # backends (base SQLite...) rattachés à ce dossier
+    if store.BACKEND != "csv": list(store.migrate(list(STRATEGIES.values()), "csv", store.BACKEND))
+    _reset()
+    yield tmp_path
+    _reset()
@@ -0,0 +1,168 @@
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data
+from bankroll import ROLLING_COLS, calculate_bankroll, calculate_gain_unit, rolling_analytics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSV_FILES = sorted(glob.glob(os.path.join(ROOT, "*.csv")))
+
+
+# ==============================================================================
+# RÉFÉRENCE : ancienne version ligne par ligne (app.py avant le moteur colonnaire)
+# ==============================================================================
+
+def reference_gain_unit(df):
+    if df.empty: return df
+    def get_gain(row):
+        statut = str(row.get("Resultat", "En attente"))
+        try: cote = float(row.get("Cote", 0.0))
+        except: cote = 0.0
+        if statut == "Gagné": return cote - 1
+        elif statut == "Perdu": return -1.0
+        else: return 0.0
+    df["Gain_Unit"] = df.apply(get_gain, axis=1)
+    return df
+
+def reference_bankroll(df):
+    if df.empty: return df
+    df = reference_gain_unit(df)
+    df["Original_Idx"] = df.index
+    df_calc = df.sort_values(by=["Date", "Original_Idx"], ascending=[True, False])
+    df_calc["Total_Bankroll"] = df_calc["Gain_Unit"].cumsum()
+    df_display = df_calc.sort_values(by=["Date", "Original_Idx"], ascending=[False, True])
+    return df_display
+
+
+def assert_same_gains(df, rtol=0.0):
+    expected = reference_gain_unit(df.copy())["Gain_Unit"].to_numpy(dtype="float64")
+    got = calculate_gain_unit(df.copy())["Gain_Unit"].to_numpy(dtype="float64")
+    np.testing.assert_allclose(got, expected, rtol=rtol, atol=0)
+
+
+# ==============================================================================
+# FICHIERS FOURNIS
+# ==============================================================================
+
+@pytest.mark.parametrize("path", CSV_FILES, ids=os.path.basename)
+def test_bundled_csv_raw(path):
+    assert_same_gains(pd.read_csv(path))
+
+@pytest.mark.parametrize("path", CSV_FILES, ids=os.path.basename)
+def test_bundled_csv_bankroll(path):
+    # Frame nettoyé comme dans l'application (Cote en float32 : cote saisie retrouvée, d'où la tolérance)
+    df = data._clean(pd.read_csv(path))
+    expected, got = reference_bankroll(df.copy()), calculate_bankroll(df.copy())
+    assert list(got.index) == list(expected.index)
+    for col in ["Gain_Unit", "Total_Bankroll"]:
+        np.testing.assert_allclose(got[col].to_numpy(dtype="float64"), expected[col].to_numpy(dtype="float64"), rtol=1e-6, atol=1e-6)
+
+
+# ==============================================================================
+# CAS LIMITES
+# ==============================================================================
+
+STATUSES = ["Gagné", "Perdu", "Remboursé", "En attente", "Annulé", "gagné", "", None, np.nan]
+
+def test_statuses():
+    n = len(STATUSES)
+    assert_same_gains(pd.DataFrame({"Resultat": STATUSES, "Cote": np.linspace(1.2, 3.0, n)}))
+
+def test_categorical_result():
+    df = pd.DataFrame({"Resultat": pd.Categorical(["Gagné", "Perdu", "Remboursé", None]), "Cote": [1.5, 2.0, 1.8, 1.3]})
+    assert_same_gains(df)
+
+def test_non_numeric_odds():
+    df = pd.DataFrame({"Resultat": ["Gagné"] * 8 + ["Perdu"] * 2,
+                       "Cote": ["1.85", "abc", "", " 2.1 ", "1,75", "inf", "nan", "1e0", "abc", "2.5"]})
+    assert_same_gains(df)
+
+def test_object_odds_mixing_nan_and_junk():
+    df = pd.DataFrame({"Resultat": ["Gagné"] * 7,
+                       "Cote": pd.Series([1.5, np.nan, "junk", None, pd.NA, "2.2", np.nan], dtype=object)})
+    assert_same_gains(df)
+    assert np.isnan(calculate_gain_unit(df.copy())["Gain_Unit"].iloc[1])
+
+def test_numeric_odds_with_nan():
+    assert_same_gains(pd.DataFrame({"Resultat": ["Gagné", "Gagné", "Perdu"], "Cote": [1.5, np.nan, np.nan]}))
+
+def test_missing_cote_column():
+    assert_same_gains(pd.DataFrame({"Resultat": ["Gagné", "Perdu", "Remboursé", "En attente"]}))
+
+def test_missing_resultat_column():
+    assert_same_gains(pd.DataFrame({"Cote": [1.5, 2.0, "x"]}))
+
+def test_empty_frame():
+    df = pd.DataFrame(columns=["Date", "Resultat", "Cote"])
+    assert calculate_gain_unit(df.copy()).empty and calculate_bankroll(df.copy()).empty
+
+def test_bankroll_order_with_same_day_bets():
+    dates = pd.to_datetime(["2026-03-02", "2026-03-02", "2026-03-01", "2026-03-02", "2026-03-01"])
+    df = pd.DataFrame({"Date": dates, "Resultat": ["Gagné", "Perdu", "Gagné", "Remboursé", "Perdu"],
+                       "Cote": [1.5, 2.0, 1.8, 1.6, 1.4]})
+    expected, got = reference_bankroll(df.copy()), calculate_bankroll(df.copy())
+    assert list(got.index) == list(expected.index)
+    np.testing.assert_array_equal(got["Total_Bankroll"].to_numpy(), expected["Total_Bankroll"].to_numpy())
+
+
+# ==============================================================================
+# ANALYSE GLISSANTE : RECALCUL NAÏF PARI PAR PARI
+# ==============================================================================
+
+def reference_rolling(df, n_bets, n_days):
+    # df dans l'ordre chronologique ; fenêtres sur les paris réglés, valeurs reprises sur les paris en attente
+    rows, settled, total, peak, streak = [], [], 0.0, 0.0, 0
+    for i in range(len(df)):
+        statut, cote, date = df["Resultat"].iloc[i], float(df["Cote"].iloc[i]), df["Date"].iloc[i]
+        gain = cote - 1 if statut == "Gagné" else -1.0 if statut == "Perdu" else 0.0
+        if statut in ("Gagné", "Perdu", "Remboursé"): settled.append((date, gain, statut == "Gagné", cote))
+        if statut == "Perdu": streak += 1
+        elif statut == "Gagné": streak = 0
+        total += gain
+        peak = max(peak, total)
+        row = {"Drawdown": peak - total, "Serie_Pertes": streak}
+        last_day = settled[-1][0] if settled else None
+        for suffix, window in (("N", settled[-n_bets:]),
+                               ("Jours", [s for s in settled if s[0] > last_day - pd.Timedelta(days=n_days)])):
+            row[f"ROI_{suffix}"] = np.mean([s[1] for s in window]) * 100 if window else np.nan
+            row[f"Reussite_{suffix}"] = np.mean([s[2] for s in window]) * 100 if window else np.nan
+            row[f"Cote_{suffix}"] = np.mean([s[3] for s in window]) if window else np.nan
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+@pytest.mark.parametrize("n_bets,n_days", [(1, 1), (5, 7), (20, 30)])
+def test_rolling_analytics_matches_reference(n_bets, n_days):
+    rng = np.random.default_rng(3)
+    n = 300
+    # Plusieurs paris par jour, trous de plusieurs jours, séries de pertes coupées par des paris en attente / remboursés
+    df = pd.DataFrame({
+        "Date": pd.Timestamp("2026-01-01") + pd.to_timedelta(np.sort(rng.integers(0, 200, n))[::-1], unit="D"),
+        "Cote": rng.uniform(1.1, 3.0, n).round(2),
+        "Resultat": rng.choice(["Gagné", "Perdu", "Remboursé", "En attente"], n, p=[0.4, 0.35, 0.1, 0.15]),
+    })
+    df.loc[n - 12:n - 1, "Resultat"] = ["Perdu", "En attente", "Perdu", "Remboursé", "Perdu", "Gagné",
+                                        "En attente", "En attente", "Perdu", "Remboursé", "Perdu", "Perdu"][::-1]
+    chrono = calculate_bankroll(df.copy()).iloc[::-1]
+    out, summary = rolling_analytics(chrono, n_bets, n_days)
+    expected = reference_rolling(chrono, n_bets, n_days)
+    for col in ROLLING_COLS:
+        np.testing.assert_allclose(out[col].to_numpy(dtype="float64"), expected[col].to_numpy(dtype="float64"), atol=1e-9, err_msg=col)
+    assert summary["drawdown"] == pytest.approx(expected["Drawdown"].iloc[-1], abs=1e-9)
+    assert summary["max_drawdown"] == pytest.approx(expected["Drawdown"].max(), abs=1e-9)
+    assert summary["losing_streak"] == expected["Serie_Pertes"].iloc[-1]
+    assert summary["max_losing_streak"] == expected["Serie_Pertes"].max()
+    assert summary["alert"] == (expected["Serie_Pertes"].iloc[-1] >= 2)
+    assert summary["roi_n"] == pytest.approx(expected["ROI_N"].iloc[-1], abs=1e-9)
+    assert summary["win_rate_days"] == pytest.approx(expected["Reussite_Jours"].iloc[-1], abs=1e-9)
+
+def test_rolling_index_matches_rolling_analytics():
+    path = os.path.join(ROOT, "paris_overs.csv")
+    df = data._clean(pd.read_csv(path))
+    out, summary = rolling_analytics(calculate_bankroll(df.copy()).iloc[::-1], 10, 14)
+    got, got_summary = data._StrategyBankroll(df, None).rolling(10, 14)
+    pd.testing.assert_frame_equal(got, out)
+    assert got_summary == summary
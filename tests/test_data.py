@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import data
+import store
+from bankroll import calculate_bankroll, odds_vector, sub_type
+from strategies import FILE_OVERS, OVERS, RECAP_STRATEGIES, STRATEGIES
+
+COLUMNS = ["Date", "Equipe", "Type_Over", "Cote", "Resultat"]
+
+
+def reread(file_path):
+    # Frame de référence : relu et nettoyé sans passer par les index
+    return data._clean(store.read_raw(file_path))
+
+def edit_page(file_path, edits):
+    # edits = {ligne de la page: {colonne: valeur ou fonction de la valeur affichée}}, enregistré comme
+    # depuis l'éditeur de l'application
+    page = data.bankroll_index.window(file_path, None, None, required=COLUMNS, rows=slice(0, 50))
+    edited = page.copy()
+    for row, values in edits.items():
+        for col, val in values.items():
+            if callable(val): val = val(page.iloc[row][col])
+            if isinstance(edited[col].dtype, pd.CategoricalDtype) and val not in edited[col].cat.categories:
+                edited[col] = edited[col].cat.add_categories([val])
+            edited.iloc[row, edited.columns.get_loc(col)] = val
+    assert data.save_from_editor(edited, file_path, COLUMNS, page, page.attrs["version"])
+
+
+# ==============================================================================
+# INDEX BANKROLL : MÊMES CHIFFRES QUE calculate_bankroll
+# ==============================================================================
+
+def assert_bankroll_index_matches(file_path):
+    df = reread(file_path)
+    dates = df["Date"].sort_values()
+    ranges = [(None, None), (dates.iloc[len(df) // 4].date(), dates.iloc[3 * len(df) // 4].date())]
+    filters = [None, ["+1.5"], ["+2.5"], ["+1.5", "+2.5"]] if "Type_Over" in df.columns else [None]
+    for start, end in ranges:
+        for types in filters:
+            sel = df if start is None else df[(df["Date"] >= pd.Timestamp(start)) & (df["Date"] <= pd.Timestamp(end))]
+            if types: sel = sel[sub_type(sel).isin(types).to_numpy()]
+            got = data.bankroll_index.window(file_path, start, end, types)
+            kpis = data.bankroll_index.kpis(file_path, start, end, types)
+            assert kpis["nb"] == len(got) == len(sel)
+            if sel.empty: continue
+            expected = calculate_bankroll(sel.copy())
+            assert list(got.index) == list(got["Original_Idx"]) == list(expected.index)
+            for col in ["Gain_Unit", "Total_Bankroll"]:
+                np.testing.assert_allclose(got[col].to_numpy(dtype="float64"), expected[col].to_numpy(dtype="float64"), atol=1e-9)
+            for col in df.columns:
+                assert got[col].astype(object).tolist() == expected[col].astype(object).tolist(), col
+            assert kpis["gain"] == pytest.approx(expected["Gain_Unit"].sum(), abs=1e-9)
+            assert kpis["avg_odds"] == pytest.approx(odds_vector(expected["Cote"]).mean(), abs=1e-9)
+            assert kpis["win_rate"] == pytest.approx((expected["Resultat"] == "Gagné").mean() * 100, abs=1e-9)
+            # Page du tableau : mêmes lignes que la fenêtre entière, cumul compris
+            page = data.bankroll_index.window(file_path, start, end, types, rows=slice(5, 25))
+            pd.testing.assert_frame_equal(page, got.iloc[5:25])
+
+@pytest.mark.parametrize("file_path", sorted(STRATEGIES.values()))
+def test_bankroll_index_after_writes(bundled, file_path):
+    assert_bankroll_index_matches(file_path)
+    df = reread(file_path)
+    last, first = df["Date"].max(), df["Date"].min()
+    bet = {c: df[c].iloc[0] for c in df.columns if c not in ("Date", "Resultat")}
+    writes = [
+        # Cas courant (dernier jour), puis un pari au milieu de l'historique
+        lambda: data.add_new_bet(file_path, {**bet, "Date": last.strftime("%Y-%m-%d"), "Equipe": "Ajout fin", "Resultat": "Gagné"}),
+        lambda: data.add_new_bet(file_path, {**bet, "Date": (first + (last - first) / 2).strftime("%Y-%m-%d"), "Equipe": "Ajout milieu", "Resultat": "Perdu"}),
+        lambda: edit_page(file_path, {0: {"Resultat": "Perdu"}, 3: {"Cote": 2.35, "Resultat": "Gagné"}}),
+        lambda: edit_page(file_path, {7: {"Date": first.to_pydatetime()}}),
+    ]
+    if "Type_Over" in df.columns: writes.append(lambda: edit_page(file_path, {9: {"Type_Over": lambda t: "+2.5" if t == "+1.5" else "+1.5"}}))
+    for write in writes:
+        write()
+        assert file_path in data.bankroll_index._by_file  # mis à jour, pas reconstruit
+        assert_bankroll_index_matches(file_path)
+
+
+# ==============================================================================
+# AGRÉGATS MENSUELS : MÊME RÉCAP QU'UN RECALCUL COMPLET
+# ==============================================================================
+
+def recap_from_scratch(strategies, sub_types):
+    for file_path in strategies.values(): data.monthly_rollups._by_file.pop(file_path, None)
+    data.frame_cache.clear()
+    return data.monthly_rollups.recap(strategies, sub_types)
+
+def test_monthly_rollups_after_edits(bundled):
+    filters = [None, {OVERS: ["+1.5"]}]
+    for sub_types in filters: data.monthly_rollups.recap(RECAP_STRATEGIES, sub_types)
+    first = reread(FILE_OVERS)["Date"].min()
+    edits = [
+        {0: {"Resultat": "Gagné"}, 1: {"Resultat": "Perdu"}, 4: {"Resultat": "Remboursé"}},
+        {2: {"Date": (first - pd.Timedelta(days=45)).to_pydatetime()}},  # mois absent jusque-là
+        {5: {"Date": first.to_pydatetime()}, 6: {"Cote": 3.1, "Resultat": "Gagné"}},
+        {8: {"Type_Over": lambda t: "+2.5" if t == "+1.5" else "+1.5"}, 9: {"Type_Over": lambda t: "+2.5" if t == "+1.5" else "+1.5"}},
+    ]
+    for edit in edits:
+        edit_page(FILE_OVERS, edit)
+        assert FILE_OVERS in data.monthly_rollups._by_file  # mis à jour, pas reconstruit
+        incremental = [data.monthly_rollups.recap(RECAP_STRATEGIES, f) for f in filters]
+        for got, sub_types in zip(incremental, filters):
+            # (reconstruit ici, l'écriture suivante repart d'un index chaud)
+            pd.testing.assert_frame_equal(got, recap_from_scratch(RECAP_STRATEGIES, sub_types), check_exact=False, rtol=0, atol=1e-9)
@@ -0,0 +1,67 @@
+import datetime
+import json
+
+import pandas as pd
+import pytest
+
+import data
+import report
+import store
+from strategies import FILE_GOLD, FILE_OVERS, OVERS, RECAP_STRATEGIES, STRATEGIES
+
+CHUNK = 7  # tranches plus petites que les journaux et les fichiers : plusieurs tranches par stratégie
+FILTERS = [[], ["+1.5"], ["+2.5"]]
+
+
+@pytest.fixture
+def journaled(bundled):
+    # Overs avec un journal non fusionné d'ajouts et de modifications (dont un changement de mois), Prono en Or modifié
+    last = data.clean_and_read_csv(FILE_OVERS)["Date"].max()
+    bet = {"Equipe": "Ajout", "Type_Over": "+1.5", "Cote": 1.8}
+    data.add_new_bet(FILE_OVERS, {**bet, "Date": last.strftime("%Y-%m-%d"), "Resultat": "En attente"})
+    data.add_new_bet(FILE_OVERS, {**bet, "Date": "2026-02-14", "Type_Over": "2.5", "Resultat": "Gagné"})
+    store.patch_rows(FILE_OVERS, {3: {"Resultat": "Perdu"}, 7: {"Date": "2026-03-10", "Cote": 3.3}, 12: {"Type_Over": "+2.5"}})
+    data.add_new_bet(FILE_OVERS, {**bet, "Date": (last + pd.Timedelta(days=2)).strftime("%Y-%m-%d"), "Resultat": "En attente"})
+    store.patch_rows(FILE_GOLD, {1: {"Date": "10/04/2026"}})
+    backend = store.get_backend()
+    if isinstance(backend, store.JournalBackend):
+        assert {json.loads(line)["op"] for line in backend._journal_lines(FILE_OVERS)[1:]} == {"add", "set"}
+    return last
+
+
+def listing(df):
+    return df.astype(object).where(df.notna(), None).reset_index(drop=True)
+
+
+# ==============================================================================
+# RAPPORTS = CHIFFRES DES PAGES
+# ==============================================================================
+
+@pytest.mark.parametrize("types", FILTERS, ids=str)
+def test_recap_matches_monthly_rollups(journaled, types):
+    expected = data.monthly_rollups.recap(RECAP_STRATEGIES, {OVERS: types})
+    pd.testing.assert_frame_equal(report.recap(RECAP_STRATEGIES, {OVERS: types}, CHUNK), expected, check_exact=False, rtol=0, atol=1e-9)
+
+def test_kpis_match_bankroll_index(journaled):
+    ranges = [(datetime.date(2000, 1, 1), datetime.date(2100, 1, 1)), (datetime.date(2026, 3, 1), datetime.date(2026, 3, 31)),
+              (journaled.date(), journaled.date())]
+    for name, file_path in STRATEGIES.items():
+        for start, end in ranges:
+            for types in (FILTERS if name == OVERS else [None]):
+                expected = data.bankroll_index.kpis(file_path, start, end, types)
+                got = report.kpis(file_path, start, end, types, CHUNK)
+                assert got["nb"] == expected["nb"], (name, start, end, types)
+                for key in ("gain", "avg_odds", "win_rate"): assert got[key] == pytest.approx(expected[key], abs=1e-9)
+
+def test_listings_match_date_index(journaled):
+    for day in [journaled, pd.Timestamp("2026-03-10"), pd.Timestamp("2026-02-14"), pd.Timestamp("2026-04-10")]:
+        expected = data.date_index.on(STRATEGIES, day)
+        assert not expected.empty
+        pd.testing.assert_frame_equal(listing(report.bets_on(STRATEGIES, day, CHUNK)), listing(expected))
+    for start, end in [("2026-02-01", "2026-03-31"), (journaled - pd.Timedelta(days=20), journaled + pd.Timedelta(days=5))]:
+        expected = data.date_index.between(STRATEGIES, start, end)
+        pd.testing.assert_frame_equal(listing(report.bets_between(STRATEGIES, start, end, chunksize=CHUNK)), listing(expected))
+    start = journaled - pd.Timedelta(days=3)
+    expected = data.date_index.pending(STRATEGIES, 7, start)
+    assert (expected["Equipe"] == "Ajout").sum() == 2
+    pd.testing.assert_frame_equal(listing(report.pending(STRATEGIES, 7, start, CHUNK)), listing(expected))
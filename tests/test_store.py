@@ -0,0 +1,138 @@
+import glob
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import store
+
+
+@pytest.fixture
+def strategy(tmp_path, monkeypatch):
+    # Petite stratégie CSV (3 paris, le plus récent en premier), sans compaction automatique
+    monkeypatch.setattr(store, "JOURNAL_MAX_OPS", 10 ** 9)
+    path = str(tmp_path / "paris.csv")
+    pd.DataFrame({"Date": ["2026-03-03", "2026-03-02", "2026-03-01"], "Equipe": ["C", "B", "A"],
+                  "Cote": [1.5, 1.8, 2.1], "Resultat": ["Gagné", "Perdu", "Gagné"]}).to_csv(path, index=False)
+    return store.CsvBackend(), path
+
+
+def add(backend, path, team):
+    with store.write_lock(path): backend.append_rows(path, [{"Date": "2026-03-04", "Equipe": team, "Cote": 1.4, "Resultat": "En attente"}])
+
+
+# ==============================================================================
+# JOURNAL : LE FICHIER DE BASE CHANGE À CÔTÉ
+# ==============================================================================
+
+def test_touch_keeps_journal(strategy):
+    backend, path = strategy
+    add(backend, path, "D")
+    backend.patch_rows(path, {1: {"Resultat": "Perdu"}})  # C
+    os.utime(path, ns=(0, 0))
+    add(backend, path, "E")
+    df = backend.read(path)
+    assert list(df["Equipe"]) == ["E", "D", "C", "B", "A"]
+    assert list(df["Resultat"]) == ["En attente", "En attente", "Perdu", "Perdu", "Gagné"]
+
+def test_copy_keeps_journal(strategy):
+    backend, path = strategy
+    add(backend, path, "D")
+    shutil.copy(path, path + ".bak")
+    os.replace(path + ".bak", path)  # autre inode, même contenu
+    assert list(backend.read(path)["Equipe"]) == ["D", "C", "B", "A"]
+
+def test_outside_edit_with_same_row_count_replays_journal(strategy):
+    backend, path = strategy
+    add(backend, path, "D")
+    raw = pd.read_csv(path)
+    raw.loc[1, "Equipe"] = "B2"
+    raw.to_csv(path, index=False)
+    add(backend, path, "E")
+    assert list(backend.read(path)["Equipe"]) == ["E", "D", "C", "B2", "A"]
+
+def test_row_count_change_sets_journal_aside(strategy):
+    backend, path = strategy
+    add(backend, path, "D")
+    pd.read_csv(path).iloc[1:].to_csv(path, index=False)
+    with pytest.raises(store.JournalMismatchError):
+        backend.read(path)
+    orphans = glob.glob(path + store.JOURNAL_SUFFIX + "*" + store.ORPHAN_SUFFIX)
+    assert len(orphans) == 1 and '"Equipe": "D"' in open(orphans[0], encoding="utf-8").read()
+    assert list(backend.read(path)["Equipe"]) == ["B", "A"]
+
+
+# ==============================================================================
+# VERSION LOGIQUE (contrôle optimiste des écritures)
+# ==============================================================================
+
+def test_compaction_keeps_version(strategy):
+    backend, path = strategy
+    add(backend, path, "D")
+    seen = backend.version(path)
+    backend.compact(path)
+    assert len(backend._journal_lines(path)) == 1  # journal fusionné (en-tête seul)
+    assert backend.version(path) == seen
+    backend.patch_rows(path, {0: {"Resultat": "Gagné"}}, expected=seen)  # pas de StaleVersionError
+    assert backend.version(path) != seen
+
+def test_every_write_changes_version(strategy):
+    backend, path = strategy
+    seen = [backend.version(path)]
+    add(backend, path, "D")
+    seen.append(backend.version(path))
+    backend.patch_rows(path, {1: {"Resultat": "Perdu"}})
+    seen.append(backend.version(path))
+    backend.write(path, backend.read(path))
+    seen.append(backend.version(path))
+    assert len(set(map(str, seen))) == len(seen)
+    with pytest.raises(store.StaleVersionError):
+        backend.patch_rows(path, {0: {"Resultat": "Perdu"}}, expected=seen[1])
+
+def test_version_after_outside_changes(strategy):
+    backend, path = strategy
+    add(backend, path, "D")
+    seen = backend.version(path)
+    os.utime(path, ns=(0, 0))
+    assert backend.version(path) == seen  # même contenu
+    raw = pd.read_csv(path)
+    raw.loc[0, "Cote"] = 9.9
+    raw.to_csv(path, index=False)
+    assert backend.version(path) != seen
+
+
+# ==============================================================================
+# CHANGE-SET DE L'ÉDITEUR
+# ==============================================================================
+
+def test_edited_float32_odds_are_written_as_typed(strategy):
+    backend, path = strategy
+    displayed = pd.DataFrame({"Original_Idx": [0, 1], "Cote": np.array([1.5, 1.8], dtype="float32")})
+    edited = displayed.copy()
+    edited.iat[0, 1] = 2.35  # comme st.data_editor : écriture d'un float Python dans la colonne float32
+    changes = store.editor_changes(displayed, edited, ["Cote"])
+    assert changes == {0: {"Cote": 2.35}}
+    backend.patch_rows(path, changes)
+    backend.compact(path)
+    assert open(path, encoding="utf-8").read().splitlines()[1].split(",")[2] == "2.35"
+
+
+# ==============================================================================
+# IMPORT EN MASSE
+# ==============================================================================
+
+@pytest.mark.parametrize("max_ops", [10 ** 9, 3], ids=["journal", "fusion"])
+def test_append_chunks_matches_concat(strategy, monkeypatch, max_ops):
+    backend, path = strategy
+    add(backend, path, "D")
+    before = backend.read(path)
+    monkeypatch.setattr(store, "JOURNAL_MAX_OPS", max_ops)
+    chunks = [pd.DataFrame({"Date": ["2026-04-01", "2026-04-02"], "Equipe": ["I1", "I2"], "Cote": [1.5, 2.5]}),
+              [{"Date": "2026-04-03", "Equipe": "I3", "Cote": 1.7}]]
+    with store.write_lock(path): assert backend.append_chunks(path, iter(chunks)) == 3
+    df = backend.read(path)
+    assert list(df["Equipe"]) == ["I3", "I2", "I1"] + list(before["Equipe"])
+    assert list(df["Cote"][:3]) == [1.7, 2.5, 1.5]
+    assert not glob.glob(path + "*.tmp")